@@ -0,0 +1,141 @@
+"""Headless batch runs over many keywords with one login and one browser"""
+
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+from screpa import Screpa
+from sinks import LEAD_FIELDS, CsvSink, JsonlSink, lead_key
+
+BATCH_FIELDS = LEAD_FIELDS + ["keywords"]
+
+
+def read_keywords(path: Path) -> List[str]:
+    """Keywords from a file, one per line, skipping blanks and # comments"""
+    keywords = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            keyword = line.strip()
+            if keyword and not keyword.startswith("#") and keyword not in keywords:
+                keywords.append(keyword)
+    return keywords
+
+
+class BatchRunner:
+    """Search a list of keywords and enrich every company once
+
+    Searches run one after another on a single logged in page, only the
+    profile enrichment is concurrent. Companies found under
+    several keywords are merged by profile URL before enrichment, so each
+    profile is fetched once and its lead lists every matching keyword.
+    """
+
+    def __init__(self, scraper: Screpa, pages: int = 2):
+        self.scraper = scraper
+        self.pages = pages
+        self.keywords: List[str] = []
+        self.merged: Dict[str, Dict] = {}
+        self.failed: List[str] = []
+
+    def add_keywords(self, keywords: List[str]):
+        for keyword in keywords:
+            if keyword not in self.keywords:
+                self.keywords.append(keyword)
+
+    def merge(self, keyword: str, results: List[Dict]) -> int:
+        """Merge one keyword's results, returning how many were new"""
+        new = 0
+        for result in results:
+            key = lead_key(result)
+            if key not in self.merged:
+                self.merged[key] = dict(result, keywords=[])
+                new += 1
+            if keyword not in self.merged[key]["keywords"]:
+                self.merged[key]["keywords"].append(keyword)
+        return new
+
+    def search_all(self):
+        """Search every keyword in turn on one shared logged in page"""
+        total = len(self.keywords)
+        with self.scraper.search_session() as page:
+            for done, keyword in enumerate(self.keywords, 1):
+                print(f"\n[{done}/{total}] Keyword '{keyword}'")
+                try:
+                    results = self.scraper.search_keyword(page, keyword, self.pages)
+                except Exception as e:
+                    print(f"Keyword '{keyword}' failed: {str(e)}")
+                    self.failed.append(keyword)
+                    continue
+                new = self.merge(keyword, results)
+                print(
+                    f"Keyword '{keyword}': {len(results)} results, {new} new "
+                    f"({len(self.merged)} unique companies)"
+                )
+
+    def iter_leads(self):
+        """Search every keyword, then yield each unique lead enriched"""
+        self.search_all()
+
+        results = []
+        for result in self.merged.values():
+            result["keywords"] = "; ".join(result["keywords"])
+            results.append(result)
+
+        yield from self.scraper.iter_enriched(results)
+        self.scraper.print_summaries()
+        if self.failed:
+            print(f"Failed keywords: {', '.join(self.failed)}")
+
+
+if __name__ == "__main__":
+    required_envs = ["XING_EMAIL", "XING_PASSWORD"]
+    if not all(os.getenv(e) for e in required_envs):
+        print("Missing environment variables. Required:", required_envs)
+        exit(1)
+
+    http_fetch = "--http" in sys.argv
+    rich_summary = "--rich" in sys.argv
+    refresh_days = None
+    for arg in sys.argv[1:]:
+        if arg.startswith("--refresh-days="):
+            refresh_days = float(arg.split("=", 1)[1])
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if not args:
+        print(
+            "Usage: python3 batch.py keywords.txt [pages] [concurrency] [--http] [--rich]"
+        )
+        exit(1)
+
+    keywords = read_keywords(Path(args[0]))
+    pages = int(args[1]) if len(args) > 1 else 2
+    concurrency = int(args[2]) if len(args) > 2 else 4
+
+    print("Screpa Lead Generator v1.0.0 (batch)")
+    print("Configuration:")
+    print(f"- Keywords: {len(keywords)} from {args[0]}")
+    print(f"- Number of pages per keyword: {pages}")
+    print(f"- Concurrent profile fetches: {concurrency}")
+
+    runner = BatchRunner(
+        Screpa(
+            concurrency=concurrency,
+            headless=True,
+            http_fetch=http_fetch,
+            rich_summary=rich_summary,
+            refresh_days=refresh_days,
+        ),
+        pages,
+    )
+    runner.add_keywords(keywords)
+
+    try:
+        with CsvSink(
+            "screpa_batch_leads.csv", fieldnames=BATCH_FIELDS
+        ) as csv_sink, JsonlSink("screpa_batch_leads.jsonl") as jsonl_sink:
+            for lead in runner.iter_leads():
+                csv_sink.write(lead)
+                jsonl_sink.write(lead)
+        print(f"\nCompleted! Saved {csv_sink.written} unique leads to CSV and JSONL")
+    except Exception as e:
+        print(f"Error: {str(e)}")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Benchmark the HTML parser backends against saved pages in results/
+
+Replays every saved search page (xing_search_*.html) and cached profile
+page through each backend, reporting pages/sec and any page whose output
+differs from the html.parser baseline.
+
+Usage:
+    python3 bench_parsers.py [results_dir] [repeat]
+"""
+
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+import parsers
+from cache import ProfileCache
+from screpa import Screpa
+
+
+def load_corpus(results_dir: Path):
+    """Load saved search pages and cached profile pages"""
+    search_pages = [
+        f.read_text(encoding="utf-8") for f in sorted(results_dir.glob("xing_*.html"))
+    ]
+    profile_pages = [
+        f.read_text(encoding="utf-8")
+        for f in sorted(results_dir.glob("company_*.html"))
+    ]
+    cache_dir = results_dir / "cache"
+    if (cache_dir / "index.sqlite").exists():
+        cache = ProfileCache(cache_dir, max_bytes=None)
+        profile_pages.extend(html for _, html in cache.iter_pages())
+        cache.close()
+    return search_pages, profile_pages
+
+
+def run_backend(scraper: Screpa, search_pages, profile_pages, repeat: int):
+    """Extract every page `repeat` times, returning elapsed seconds and outputs"""
+    outputs = []
+    # The extractors print per page, keep that out of the timings
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            outputs = [scraper.extract_search_results(h) for h in search_pages]
+            outputs += [scraper.extract_company_contact(h) for h in profile_pages]
+        elapsed = time.perf_counter() - started
+    return elapsed, outputs
+
+
+if __name__ == "__main__":
+    results_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("results")
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    search_pages, profile_pages = load_corpus(results_dir)
+    total_pages = len(search_pages) + len(profile_pages)
+    if not total_pages:
+        print(f"No saved pages found in {results_dir}")
+        exit(1)
+
+    print(
+        f"Replaying {len(search_pages)} search pages and "
+        f"{len(profile_pages)} profile pages x{repeat}"
+    )
+
+    baseline = None
+    for backend in parsers.BACKENDS:
+        scraper = Screpa(parser_backend=backend)
+        if scraper.parser_backend != backend:
+            print(f"{backend:>12}: skipped (not installed)")
+            continue
+
+        elapsed, outputs = run_backend(scraper, search_pages, profile_pages, repeat)
+        if baseline is None:
+            baseline = outputs
+        mismatches = sum(1 for a, b in zip(baseline, outputs) if a != b)
+        print(
+            f"{backend:>12}: {total_pages * repeat / elapsed:8.1f} pages/sec, "
+            f"{mismatches} pages differ from html.parser"
+        )
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Benchmark a full scrape against the local fake Xing server
+
+Runs Screpa.scrape_xing end to end (login, consent, search pagination and
+profile enrichment) against fake_xing.FakeXing in a fresh results
+directory. Reports throughput, per-stage latency and the peak RSS of the
+scraper and its browser processes.
+
+Usage:
+    python3 bench_scrape.py [pages] [concurrency] [latency_ms] [recorded_results_dir]
+"""
+
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from fake_xing import FakeXing
+from screpa import Screpa
+
+
+def tree_rss(pid: int) -> int:
+    """Resident memory of a process and all its descendants, in bytes"""
+    total = 0
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    total += int(line.split()[1]) * 1024
+        for task in Path(f"/proc/{pid}/task").iterdir():
+            children = (task / "children").read_text().split()
+            total += sum(tree_rss(int(child)) for child in children)
+    except (OSError, ValueError):
+        pass
+    return total
+
+
+class PeakRss:
+    """Sample the RSS of this process tree in the background, keep the peak
+
+    Falls back to this process's own ru_maxrss where /proc isn't available.
+    """
+
+    def __init__(self, interval: float = 0.2):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, tree_rss(os.getpid()))
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        if not self.peak:
+            self.peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def run(pages: int, concurrency: int, latency: float, recorded_dir=None) -> dict:
+    os.environ.setdefault("XING_EMAIL", "bench@example.com")
+    os.environ.setdefault("XING_PASSWORD", "bench")
+
+    with FakeXing(
+        companies=pages * 10, latency=latency, results_dir=recorded_dir
+    ) as server, tempfile.TemporaryDirectory() as results_dir:
+        scraper = Screpa(
+            concurrency=concurrency,
+            rate_limit=1000,
+            results_dir=results_dir,
+            headless=True,
+            base_url=server.url,
+            login_url=f"{server.url}/login",
+        )
+        with PeakRss() as rss:
+            started = time.perf_counter()
+            leads = scraper.scrape_xing("bench", pages)
+            elapsed = time.perf_counter() - started
+
+        timers = scraper.metrics.summary()
+        return {
+            "pages": pages,
+            "concurrency": concurrency,
+            "latency": latency,
+            "leads": len(leads),
+            "with_email": sum(1 for lead in leads if lead.get("email")),
+            "requests": server.requests,
+            "elapsed": elapsed,
+            "leads_per_min": len(leads) / elapsed * 60 if elapsed else 0,
+            "peak_rss_mb": rss.peak / 1024 / 1024,
+            "timers": {
+                name: timers[name]
+                for name in (
+                    "login",
+                    "search",
+                    "load_more_results",
+                    "parse_search",
+                    "profile",
+                    "profile_async",
+                    "navigate_with_retry",
+                    "parse_profile",
+                )
+                if name in timers
+            },
+        }
+
+
+if __name__ == "__main__":
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    latency = (int(sys.argv[3]) if len(sys.argv) > 3 else 50) / 1000
+    recorded_dir = Path(sys.argv[4]) if len(sys.argv) > 4 else None
+
+    report = run(pages, concurrency, latency, recorded_dir)
+
+    print(
+        f"\n{report['leads']} leads ({report['with_email']} with email) from "
+        f"{report['pages']} pages in {report['elapsed']:.1f}s: "
+        f"{report['leads_per_min']:.1f} leads/min, {report['requests']} requests, "
+        f"peak RSS {report['peak_rss_mb']:.0f} MB"
+    )
+    for name, stats in report["timers"].items():
+        print(
+            f"{name:>20}: {stats['count']}x, p50 {stats['p50'] * 1000:.0f} ms, "
+            f"p95 {stats['p95'] * 1000:.0f} ms, max {stats['max'] * 1000:.0f} ms"
+        )
+    with open("bench_scrape.json", "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print("Saved benchmark report to bench_scrape.json")
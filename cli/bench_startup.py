@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Check the startup cost of the main.py subcommands against a budget
+
+Runs each light subcommand in a fresh interpreter under `-X importtime`,
+sums the import time and checks that none of the heavy modules was
+loaded. Then smoke checks the heavy paths those subcommands defer: the
+modules behind scrape and reextract must import, and every global name
+their functions use must resolve, so a lazy import that went missing
+shows up here instead of as a NameError mid-run. Exits with status 1 when
+a subcommand is over budget or a check fails, so it can gate CI.
+
+Usage:
+    python3 bench_startup.py [budget_ms] [runs]
+"""
+
+import builtins
+import dis
+import importlib
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from pathlib import Path
+from typing import List
+
+MAIN = Path(__file__).with_name("main.py")
+# Modules only the scrape and reextract subcommands may load
+HEAVY_MODULES = (
+    "playwright",
+    "bs4",
+    "lxml",
+    "httpx",
+    "pandas",
+    "numpy",
+    "torch",
+    "transformers",
+    "screpa",
+)
+# Modules the scrape path loads, directly or through lazy imports
+SCRAPE_MODULES = (
+    "screpa",
+    "enrich",
+    "http_fetch",
+    "batch",
+    "distributed",
+    "reextract",
+    "main",
+    "playwright.sync_api",
+    "playwright.async_api",
+)
+
+
+def import_profile(stderr: str):
+    """Total import microseconds and top-level package names from -X importtime"""
+    total = 0
+    packages = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        total += int(self_us)
+        packages.add(name.strip().split(".")[0])
+    return total, packages
+
+
+def unresolved_globals(module: types.ModuleType) -> List[str]:
+    """Global names used by a module's code that the module never defines"""
+    code_objects = [compile(Path(module.__file__).read_text(), module.__file__, "exec")]
+    missing = set()
+    while code_objects:
+        code = code_objects.pop()
+        for instruction in dis.get_instructions(code):
+            name = instruction.argval
+            if (
+                instruction.opname == "LOAD_GLOBAL"
+                and not hasattr(module, name)
+                and not hasattr(builtins, name)
+            ):
+                missing.add(name)
+        code_objects.extend(c for c in code.co_consts if isinstance(c, types.CodeType))
+    return sorted(missing)
+
+
+def check_scrape_path() -> bool:
+    """Import every scrape path module and resolve the globals of our own"""
+    ok = True
+    for name in SCRAPE_MODULES:
+        try:
+            module = importlib.import_module(name)
+        except ImportError as e:
+            print(f"{name:>20}: import failed: {e}")
+            ok = False
+            continue
+        if Path(getattr(module, "__file__", "")).parent != MAIN.parent:
+            continue
+        missing = unresolved_globals(module)
+        if missing:
+            print(f"{name:>20}: undefined names {', '.join(missing)}")
+            ok = False
+    print(f"Scrape path: {'OK' if ok else 'FAILED'}")
+    return ok
+
+
+def measure(args, runs: int = 5):
+    """Best wall time (ms), its import time (ms) and heavy modules loaded"""
+    best = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", str(MAIN), *args],
+            capture_output=True,
+            text=True,
+            cwd=MAIN.parent,
+        )
+        wall = (time.perf_counter() - started) * 1000
+        if completed.returncode != 0:
+            raise RuntimeError(f"main.py {' '.join(args)} failed:\n{completed.stderr}")
+        import_us, packages = import_profile(completed.stderr)
+        if best is None or wall < best[0]:
+            best = (
+                wall,
+                import_us / 1000,
+                sorted(packages.intersection(HEAVY_MODULES)),
+            )
+    return best
+
+
+if __name__ == "__main__":
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else 200
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as tmp:
+        commands = {
+            "cache-stats": ["cache-stats", "--results-dir", tmp],
+            "export": [
+                "export",
+                "--db",
+                str(Path(tmp) / "leads.sqlite"),
+                "--output",
+                str(Path(tmp) / "leads.csv"),
+            ],
+        }
+        over_budget = False
+        for name, args in commands.items():
+            wall, imports, heavy = measure(args, runs)
+            ok = wall < budget and not heavy
+            over_budget = over_budget or not ok
+            print(
+                f"{name:>12}: {wall:6.0f} ms wall, {imports:6.0f} ms importing"
+                f"{', loaded ' + ', '.join(heavy) if heavy else ''}"
+                f"  {'OK' if ok else 'OVER BUDGET'}"
+            )
+
+    print(f"Budget: {budget:.0f} ms per subcommand, no heavy modules")
+    scrape_path_ok = check_scrape_path()
+    exit(1 if over_budget or not scrape_path_ok else 0)
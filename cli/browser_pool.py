@@ -0,0 +1,95 @@
+"""Reusable browser page pool for Screpa profile fetching"""
+
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+
+class BrowserPool:
+    """Pool of browser pages shared across company profile fetches
+
+    Playwright and a single Chromium instance are started when the first
+    page is borrowed, so a run served entirely from the cache never
+    launches a browser. Each slot owns its own context and page; a slot is
+    recycled (context closed and replaced) after `recycle_after`
+    navigations so long runs don't accumulate renderer memory.
+    """
+
+    def __init__(
+        self,
+        recycle_after: int = 50,
+        headless: bool = False,
+        context_options: Optional[Dict] = None,
+        setup_context: Optional[Callable] = None,
+    ):
+        self.playwright = None
+        self.recycle_after = recycle_after
+        self.headless = headless
+        self.context_options = context_options or {
+            "viewport": {"width": 1920, "height": 1080}
+        }
+        self.setup_context = setup_context  # Called with every new context
+        self.browser = None
+        self.recycled = 0
+        self._idle = deque()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def open(self):
+        """Start Playwright and launch the shared browser"""
+        if self.browser is None:
+            from playwright.sync_api import sync_playwright
+
+            self.playwright = sync_playwright().start()
+            self.browser = self.playwright.chromium.launch(headless=self.headless)
+        return self
+
+    def _new_slot(self) -> Dict:
+        context = self.browser.new_context(**self.context_options)
+        if self.setup_context is not None:
+            self.setup_context(context)
+        return {"context": context, "page": context.new_page(), "navigations": 0}
+
+    def _close_slot(self, slot: Dict):
+        try:
+            slot["context"].close()
+        except Exception as e:
+            print(f"Error closing pooled context: {str(e)}")
+
+    @contextmanager
+    def page(self):
+        """Borrow a page from the pool, recycling it when it is worn out"""
+        if self.browser is None:
+            self.open()
+
+        slot = self._idle.popleft() if self._idle else self._new_slot()
+        try:
+            yield slot["page"]
+        finally:
+            slot["navigations"] += 1
+            if slot["page"].is_closed() or (
+                self.recycle_after and slot["navigations"] >= self.recycle_after
+            ):
+                self._close_slot(slot)
+                self.recycled += 1
+                slot = None
+            if slot is not None:
+                self._idle.append(slot)
+
+    def close(self):
+        """Close every pooled context, the shared browser and Playwright"""
+        while self._idle:
+            self._close_slot(self._idle.popleft())
+        if self.browser is not None:
+            try:
+                self.browser.close()
+            except Exception as e:
+                print(f"Error closing pooled browser: {str(e)}")
+            self.browser = None
+        if self.playwright is not None:
+            self.playwright.stop()
+            self.playwright = None
@@ -0,0 +1,334 @@
+"""Persistent, content-addressed HTML cache for company profile pages"""
+
+import gzip
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL so equivalent profile URLs share one cache key"""
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
+
+
+def cache_key(url: str) -> str:
+    """Stable SHA-256 cache key of the normalized URL"""
+    return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+
+def read_page(filepath: Path, compression: Optional[str]) -> str:
+    """Read and decompress a stored page"""
+    data = Path(filepath).read_bytes()
+    if compression == "gzip":
+        data = gzip.decompress(data)
+    elif compression == "zstd":
+        import zstandard
+
+        data = zstandard.ZstdDecompressor().decompress(data)
+    return data.decode("utf-8")
+
+
+class ProfileCache:
+    """Profile HTML cache with an SQLite index, TTL and LRU eviction
+
+    Pages are stored under `cache_dir/<key[:2]>/<key>.html[.gz|.zst]` and
+    indexed with their fetch time, last access, size, HTTP status and HTTP
+    validators. Expired pages that have an ETag or Last-Modified are kept
+    so they can be revalidated with a conditional request.
+
+    The total size is kept in a one-row `totals` table by triggers on
+    `pages`, so it stays right when several runs share the cache. Access
+    times are written in batches of `batch_size` hits (and before every
+    eviction), so a hit costs no write.
+    """
+
+    SUFFIXES = {None: ".html", "gzip": ".html.gz", "zstd": ".html.zst"}
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttl: Optional[float] = 7 * 24 * 3600,
+        max_bytes: Optional[int] = 500 * 1024 * 1024,
+        compression: Optional[str] = "gzip",
+        batch_size: int = 50,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.compression = self._check_compression(compression)
+        self.batch_size = max(1, batch_size)
+        self._accessed: Dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+        self.revalidated = 0
+
+        self.db = sqlite3.connect(self.cache_dir / "index.sqlite", timeout=60)
+        self.db.execute("""CREATE TABLE IF NOT EXISTS pages (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                path TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                status INTEGER,
+                compression TEXT,
+                etag TEXT,
+                last_modified TEXT
+            )""")
+        columns = {row[1] for row in self.db.execute("PRAGMA table_info(pages)")}
+        for column in ("etag", "last_modified"):
+            if column not in columns:
+                self.db.execute(f"ALTER TABLE pages ADD COLUMN {column} TEXT")
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at)"
+        )
+        self.db.execute("""CREATE TABLE IF NOT EXISTS totals (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                bytes INTEGER NOT NULL
+            )""")
+        # Sum existing pages once, before the triggers take over
+        self.db.execute(
+            "INSERT OR IGNORE INTO totals (id, bytes) "
+            "SELECT 0, COALESCE(SUM(size), 0) FROM pages"
+        )
+        self.db.executescript("""
+            CREATE TRIGGER IF NOT EXISTS pages_size_insert AFTER INSERT ON pages
+            BEGIN UPDATE totals SET bytes = bytes + NEW.size; END;
+            CREATE TRIGGER IF NOT EXISTS pages_size_delete AFTER DELETE ON pages
+            BEGIN UPDATE totals SET bytes = bytes - OLD.size; END;
+            CREATE TRIGGER IF NOT EXISTS pages_size_update AFTER UPDATE OF size ON pages
+            BEGIN UPDATE totals SET bytes = bytes + NEW.size - OLD.size; END;
+            """)
+        self.db.commit()
+
+    def _check_compression(self, compression: Optional[str]) -> Optional[str]:
+        if compression not in self.SUFFIXES:
+            raise ValueError(f"Unknown cache compression: {compression}")
+        if compression == "zstd":
+            try:
+                import zstandard  # noqa: F401
+            except ImportError:
+                print("zstandard is not installed, falling back to gzip compression")
+                return "gzip"
+        return compression
+
+    def _encode(self, html: str) -> bytes:
+        data = html.encode("utf-8")
+        if self.compression == "gzip":
+            return gzip.compress(data)
+        if self.compression == "zstd":
+            import zstandard
+
+            return zstandard.ZstdCompressor().compress(data)
+        return data
+
+    def _remove(self, key: str, path: str):
+        self.db.execute("DELETE FROM pages WHERE key = ?", (key,))
+        (self.cache_dir / path).unlink(missing_ok=True)
+        self._accessed.pop(key, None)
+
+    def get(self, url: str) -> Optional[str]:
+        """Return the cached HTML for a URL, or None on a miss or expiry"""
+        key = cache_key(url)
+        row = self.db.execute(
+            "SELECT path, fetched_at, compression, etag, last_modified "
+            "FROM pages WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        path, fetched_at, compression, etag, last_modified = row
+        if self.ttl is not None and time.time() - fetched_at > self.ttl:
+            if not (etag or last_modified):
+                self._remove(key, path)
+                self.db.commit()
+            self.expired += 1
+            self.misses += 1
+            return None
+
+        html = self._read(key, path, compression)
+        if html is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return html
+
+    def _read(self, key: str, path: str, compression: Optional[str]) -> Optional[str]:
+        try:
+            html = read_page(self.cache_dir / path, compression)
+        except (OSError, ValueError) as e:
+            print(f"Dropping unreadable cache entry {path}: {str(e)}")
+            self._remove(key, path)
+            self.db.commit()
+            return None
+
+        self._accessed[key] = time.time()
+        if len(self._accessed) >= self.batch_size:
+            self.flush()
+        return html
+
+    def flush(self):
+        """Write the buffered access times"""
+        if self._accessed:
+            self.db.executemany(
+                "UPDATE pages SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._accessed.items()],
+            )
+            self._accessed.clear()
+        self.db.commit()
+
+    def validators(self, url: str) -> Optional[Dict[str, str]]:
+        """ETag and Last-Modified stored for a URL, expired or not"""
+        row = self.db.execute(
+            "SELECT etag, last_modified FROM pages WHERE key = ?", (cache_key(url),)
+        ).fetchone()
+        if row is None or not (row[0] or row[1]):
+            return None
+        return {"etag": row[0], "last_modified": row[1]}
+
+    def refresh(self, url: str) -> Optional[str]:
+        """Restart the TTL of a page the server reported unchanged (304)"""
+        key = cache_key(url)
+        row = self.db.execute(
+            "SELECT path, compression FROM pages WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self.db.execute(
+            "UPDATE pages SET fetched_at = ? WHERE key = ?", (time.time(), key)
+        )
+        self.db.commit()
+        html = self._read(key, *row)
+        if html is not None:
+            self.revalidated += 1
+        return html
+
+    def put(
+        self,
+        url: str,
+        html: str,
+        status: Optional[int] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> str:
+        """Store a page and evict least recently used pages over the budget"""
+        key = cache_key(url)
+        data = self._encode(html)
+        path = f"{key[:2]}/{key}{self.SUFFIXES[self.compression]}"
+        filepath = self.cache_dir / path
+        filepath.parent.mkdir(exist_ok=True)
+
+        old = self.db.execute("SELECT path FROM pages WHERE key = ?", (key,)).fetchone()
+        if old and old[0] != path:
+            (self.cache_dir / old[0]).unlink(missing_ok=True)
+
+        filepath.write_bytes(data)
+        now = time.time()
+        self.db.execute(
+            "INSERT INTO pages (key, url, path, fetched_at, accessed_at, "
+            "size, status, compression, etag, last_modified) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            # An upsert, since REPLACE would skip the size delete trigger
+            "ON CONFLICT (key) DO UPDATE SET url = excluded.url, "
+            "path = excluded.path, fetched_at = excluded.fetched_at, "
+            "accessed_at = excluded.accessed_at, size = excluded.size, "
+            "status = excluded.status, compression = excluded.compression, "
+            "etag = excluded.etag, last_modified = excluded.last_modified",
+            (
+                key,
+                normalize_url(url),
+                path,
+                now,
+                now,
+                len(data),
+                status,
+                self.compression,
+                etag,
+                last_modified,
+            ),
+        )
+        self.db.commit()
+        self._accessed.pop(key, None)
+        self.evict()
+        return key
+
+    def entries(self) -> Dict[str, Tuple[Path, Optional[str]]]:
+        """Map every cached normalized URL to its file path and compression"""
+        rows = self.db.execute("SELECT url, path, compression FROM pages")
+        return {
+            url: (self.cache_dir / path, compression) for url, path, compression in rows
+        }
+
+    def iter_pages(self):
+        """Yield (url, html) for every cached page, ignoring the TTL"""
+        for url, (filepath, compression) in self.entries().items():
+            try:
+                yield url, read_page(filepath, compression)
+            except (OSError, ValueError) as e:
+                print(f"Skipping unreadable cache entry {filepath}: {str(e)}")
+
+    def total_bytes(self) -> int:
+        return self.db.execute("SELECT bytes FROM totals").fetchone()[0]
+
+    def evict(self):
+        """Drop least recently used pages until the cache fits in max_bytes"""
+        if self.max_bytes is None:
+            return
+        excess = self.total_bytes() - self.max_bytes
+        if excess <= 0:
+            return
+
+        self.flush()
+        rows = self.db.execute(
+            "SELECT key, path, size FROM pages ORDER BY accessed_at ASC"
+        )
+        victims = []
+        for key, path, size in rows:
+            if excess <= 0:
+                break
+            victims.append((key, path))
+            excess -= size
+        for key, path in victims:
+            self._remove(key, path)
+        self.db.commit()
+        self.evicted += len(victims)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current cache size"""
+        entries = self.db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "revalidated": self.revalidated,
+            "entries": entries,
+            "bytes": self.total_bytes(),
+        }
+
+    def print_stats(self):
+        stats = self.stats()
+        lookups = stats["hits"] + stats["misses"]
+        hit_rate = stats["hits"] / lookups * 100 if lookups else 0
+        print(
+            f"Profile cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({hit_rate:.1f}% hit rate), {stats['expired']} expired, "
+            f"{stats['revalidated']} revalidated, "
+            f"{stats['evicted']} evicted, {stats['entries']} entries "
+            f"({stats['bytes'] / 1024 / 1024:.1f} MB)"
+        )
+
+    def close(self):
+        self.flush()
+        self.db.close()
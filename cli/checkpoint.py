@@ -0,0 +1,167 @@
+"""Checkpoint files so long keyword runs can resume where they stopped"""
+
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from sinks import lead_key
+from spill import ResultSpill
+
+
+def keyword_slug(keyword: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", keyword.lower()).strip("-") or "keyword"
+
+
+class PendingResults:
+    """Lazy view of the results a checkpoint has not enriched yet
+
+    Filters `results` (a list or a ResultSpill) on every iteration instead
+    of copying them, so a spilled run is streamed rather than loaded.
+    """
+
+    def __init__(self, results: Iterable[Dict], checkpoint: "Checkpoint"):
+        self.results = results
+        self.checkpoint = checkpoint
+        self.count = sum(1 for _ in self)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Dict]:
+        for result in self.results:
+            if not self.checkpoint.is_enriched(result):
+                yield result
+
+
+class Checkpoint:
+    """Run state for one (keyword, run) pair
+
+    Search results are appended to a `ResultSpill` in
+    `<slug>-<run_id>.results.jsonl` as each page is read, and enriched leads
+    to `<slug>-<run_id>.enriched.jsonl`, so recording a page or a profile
+    costs its own lines regardless of run size. Only the keys of enriched
+    leads are kept in memory. `<slug>-<run_id>.json` holds the search state
+    and points at the results file.
+    """
+
+    def __init__(self, checkpoint_dir: Path, keyword: str, run_id: str = None):
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        self.keyword = keyword
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        stem = f"{keyword_slug(keyword)}-{self.run_id}"
+        self.state_path = self.checkpoint_dir / f"{stem}.json"
+        self.enriched_path = self.checkpoint_dir / f"{stem}.enriched.jsonl"
+        self.spill_path = self.checkpoint_dir / f"{stem}.results.jsonl"
+
+        self.pages = 0
+        self.search_complete = False
+        self.results = ResultSpill(self.spill_path, resume=True)
+        self.enriched: Set[str] = set()
+        self.load()
+
+    @staticmethod
+    def run_files(checkpoint_dir: Path, keyword: str) -> Dict[str, List[Path]]:
+        """Checkpoint files of every run of a keyword, by run id"""
+        # Match exact run ids so "real" doesn't pick up "real estate" runs
+        pattern = re.compile(
+            re.escape(keyword_slug(keyword)) + r"-(\d{8}_\d{6})\.[a-z.]+"
+        )
+        runs: Dict[str, List[Path]] = {}
+        for f in Path(checkpoint_dir).glob("*"):
+            match = pattern.fullmatch(f.name)
+            if match:
+                runs.setdefault(match.group(1), []).append(f)
+        return runs
+
+    @classmethod
+    def latest(cls, checkpoint_dir: Path, keyword: str) -> Optional["Checkpoint"]:
+        """Most recent checkpoint for a keyword, or None"""
+        run_ids = [
+            run_id
+            for run_id, files in cls.run_files(checkpoint_dir, keyword).items()
+            if any(f.suffix == ".json" for f in files)
+        ]
+        if not run_ids:
+            return None
+        return cls(checkpoint_dir, keyword, max(run_ids))
+
+    def remove(self) -> int:
+        """Delete this run's files and those of earlier runs, return the count"""
+        removed = 0
+        for run_id, files in self.run_files(self.checkpoint_dir, self.keyword).items():
+            if run_id <= self.run_id:
+                for f in files:
+                    f.unlink(missing_ok=True)
+                    removed += 1
+        return removed
+
+    def load(self):
+        if self.state_path.exists():
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.pages = state["pages"]
+            self.search_complete = state["search_complete"]
+            if "results" in state and not len(self.results):
+                self.results.extend(state["results"])  # Older inline format
+
+        if self.enriched_path.exists():
+            with open(self.enriched_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        lead = json.loads(line)
+                    except ValueError:
+                        continue  # Torn last line from a crash
+                    self.enriched.add(lead_key(lead))
+
+    def save(self):
+        """Atomically rewrite the search state"""
+        tmp_path = self.state_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "keyword": self.keyword,
+                    "run_id": self.run_id,
+                    "pages": self.pages,
+                    "search_complete": self.search_complete,
+                    "results_file": str(self.results.path),
+                },
+                f,
+            )
+        os.replace(tmp_path, self.state_path)
+
+    def record_page(self, all_results: Iterable[Dict], new_results: List[Dict]):
+        """Append the new results of a page to the results file
+
+        A search in bounded memory mode collects into this spill directly,
+        then there is nothing left to append.
+        """
+        if all_results is not self.results:
+            self.results.extend(new_results)
+        if not self.state_path.exists():
+            self.save()
+
+    def finish_search(self, pages: int):
+        """Mark the search for `pages` pages (or until results ran out) done"""
+        self.search_complete = True
+        self.pages = pages
+        self.save()
+
+    def has_search(self, pages: int) -> bool:
+        """Whether a finished search already covers `pages` pages"""
+        return self.search_complete and self.pages >= pages
+
+    def is_enriched(self, result: Dict) -> bool:
+        return lead_key(result) in self.enriched
+
+    def pending(self, results: Iterable[Dict]) -> PendingResults:
+        """The results not enriched yet, filtered lazily"""
+        return PendingResults(results, self)
+
+    def record_enriched(self, lead: Dict):
+        self.enriched.add(lead_key(lead))
+        with open(self.enriched_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(dict(lead), ensure_ascii=False) + "\n")
@@ -0,0 +1,197 @@
+"""Coordinator/worker mode: one process searches, many enrich profiles
+
+The coordinator runs the search pagination and queues every result in a
+SQLite job queue (results/jobs.sqlite by default). Workers, as many as
+wanted and on any machine that shares the filesystem, each log in with
+their own browser and session, lease profiles from the queue and store the
+enriched leads back in it. `collect` writes the finished leads out.
+"""
+
+import os
+import socket
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import List
+
+from job_queue import JobQueue
+from screpa import Screpa
+from sinks import CsvSink, JsonlSink
+
+DEFAULT_QUEUE = Path("results") / "jobs.sqlite"
+
+
+def make_worker_id() -> str:
+    """Host name, process id and a random suffix, unique across machines"""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+def coordinate(scraper: Screpa, queue: JobQueue, keywords: List[str], pages: int):
+    """Search every keyword on one logged in page and queue the results"""
+    with scraper.search_session() as page:
+        for keyword in keywords:
+            try:
+                results = scraper.search_keyword(page, keyword, pages)
+            except Exception as e:
+                print(f"Keyword '{keyword}' failed: {str(e)}")
+                continue
+            added = queue.push(results)
+            print(f"Keyword '{keyword}': queued {added} new of {len(results)} results")
+    queue.print_stats()
+
+
+class Worker:
+    """Lease profiles from the queue and enrich them until it is drained
+
+    The worker keeps one browser pool open until its session expires, then
+    logs in again and opens a new one. Leases are
+    renewed after every profile, so only a worker that stopped making
+    progress loses its jobs to the others. With `follow`, it keeps polling
+    for new jobs instead of exiting once the queue is empty.
+    """
+
+    def __init__(
+        self,
+        scraper: Screpa,
+        queue: JobQueue,
+        worker_id: str = None,
+        batch_size: int = 5,
+        poll_interval: float = 10.0,
+        follow: bool = False,
+    ):
+        self.scraper = scraper
+        self.queue = queue
+        self.worker_id = worker_id or make_worker_id()
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.follow = follow
+        self.enriched = 0
+        self.failed = 0
+
+    def login(self):
+        """Probe the saved session and log in again if it stopped working"""
+        with self.scraper.search_session():
+            pass
+        self.scraper.session_expired = False
+
+    def process(self, result):
+        try:
+            contact_info = self.scraper.scrape_company_profile(result["profile_url"])
+        except Exception as e:
+            print(f"Worker {self.worker_id}: {result['profile_url']} failed: {e}")
+            contact_info = {}
+
+        # An empty dict means the page never loaded, a profile without
+        # contact details still has blank email and website fields
+        if contact_info:
+            self.queue.complete(result, dict(result, **contact_info))
+            self.enriched += 1
+        else:
+            self.queue.fail(result, self.worker_id, "profile page did not load")
+            self.failed += 1
+        self.queue.renew(self.worker_id)
+
+    def work(self) -> bool:
+        """Process jobs until the queue is drained, True if a login wall hit"""
+        with self.scraper.profile_pool():
+            while True:
+                jobs = self.queue.claim(self.worker_id, self.batch_size)
+                if not jobs:
+                    # Leased jobs may still come back if their worker died
+                    if not self.follow and not self.queue.unfinished():
+                        return False
+                    time.sleep(self.poll_interval)
+                    continue
+                for result in jobs:
+                    self.process(result)
+                if self.scraper.session_expired:
+                    print(f"Worker {self.worker_id}: session expired, logging in again")
+                    return True
+
+    def run(self):
+        print(f"Worker {self.worker_id} started on {self.queue.path}")
+        # Profile contexts load the session when they are created, so the
+        # pool is reopened after every new login
+        self.login()
+        while self.work():
+            self.login()
+        print(
+            f"Worker {self.worker_id} finished: {self.enriched} enriched, "
+            f"{self.failed} failed attempts"
+        )
+        self.scraper.print_summaries()
+
+
+def collect(queue: JobQueue, scraper: Screpa = None, prefix: str = "screpa_leads"):
+    """Write every finished lead to CSV and JSONL (and the lead store)"""
+    with CsvSink(f"{prefix}.csv") as csv_sink, JsonlSink(
+        f"{prefix}.jsonl"
+    ) as jsonl_sink:
+        for lead in queue.leads():
+            csv_sink.write(lead)
+            jsonl_sink.write(lead)
+            if scraper is not None:
+                scraper.lead_store.write(lead)
+    print(f"Saved {csv_sink.written} leads to {prefix}.csv and {prefix}.jsonl")
+    failures = queue.failures()
+    if failures:
+        print(f"{len(failures)} profiles failed for good:")
+        for failure in failures:
+            print(
+                f"- {failure['key']} ({failure['attempts']} attempts): {failure['error']}"
+            )
+
+
+if __name__ == "__main__":
+    usage = (
+        "Usage:\n"
+        '  python3 distributed.py coordinate "keyword" [pages] [--queue=path]\n'
+        "  python3 distributed.py work [--queue=path] [--name=worker] [--http] "
+        "[--follow] [--results-dir=path]\n"
+        "  python3 distributed.py collect [--queue=path]\n"
+        "  python3 distributed.py status [--queue=path]"
+    )
+    options = dict(
+        arg[2:].split("=", 1)
+        for arg in sys.argv[1:]
+        if "=" in arg and arg.startswith("--")
+    )
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if not args or args[0] not in ("coordinate", "work", "collect", "status"):
+        print(usage)
+        exit(1)
+    command = args[0]
+    queue = JobQueue(Path(options.get("queue", DEFAULT_QUEUE)))
+
+    if command == "status":
+        queue.print_stats()
+        exit(0)
+    if command == "collect":
+        collect(queue, Screpa(headless=True))
+        exit(0)
+
+    required_envs = ["XING_EMAIL", "XING_PASSWORD"]
+    if not all(os.getenv(e) for e in required_envs):
+        print("Missing environment variables. Required:", required_envs)
+        exit(1)
+
+    if command == "coordinate":
+        if len(args) < 2:
+            print(usage)
+            exit(1)
+        pages = int(args[2]) if len(args) > 2 else 2
+        coordinate(Screpa(headless=True), queue, [args[1]], pages)
+    else:
+        # Give a worker a stable --name to reuse its login session on restart
+        worker_id = options.get("name") or make_worker_id()
+        # Each worker gets its own session, cache and report directory, so
+        # workers never share a browser profile or write the same SQLite file
+        results_dir = Path(options.get("results-dir", "results")) / "workers"
+        results_dir.mkdir(parents=True, exist_ok=True)
+        scraper = Screpa(
+            headless=True,
+            http_fetch="--http" in sys.argv,
+            results_dir=str(results_dir / worker_id),
+        )
+        Worker(scraper, queue, worker_id, follow="--follow" in sys.argv).run()
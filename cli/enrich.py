@@ -0,0 +1,227 @@
+"""Concurrent company profile enrichment built on Playwright's async API"""
+
+import asyncio
+import time
+from typing import Dict, List, Tuple
+from urllib.parse import urlparse
+
+from retry import OK, TokenBucket
+from waits import PROFILE_READY_SELECTOR
+
+
+class HostRateLimiter:
+    """One token bucket per host so each site is throttled independently"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    async def acquire(self, url: str):
+        host = urlparse(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate, self.burst)
+        await self.buckets[host].acquire_async()
+
+
+class AdaptiveGate:
+    """Let at most `limit.current` page loads run at once, as the limit moves"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: self.in_flight < max(1, self.limit.current)
+            )
+            self.in_flight += 1
+
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+
+class ConcurrentEnricher:
+    """Fetch up to `concurrency` profiles at once behind a per-host rate limit
+
+    Results are updated in place, so the input order is preserved. The
+    enricher never touches the profile cache, whose SQLite connection
+    belongs to the caller's thread: the caller skips cached profiles and
+    stores the fetched pages handed to `on_result`.
+    """
+
+    def __init__(
+        self,
+        scraper,
+        concurrency: int = 4,
+        rate: float = 0.5,
+        burst: int = 2,
+        ready_timeout: int = 10000,
+        max_retries: int = None,
+    ):
+        self.scraper = scraper
+        self.concurrency = max(1, concurrency)
+        self.limiter = HostRateLimiter(rate, burst)
+        self.ready_timeout = ready_timeout
+        self.policy = scraper.retry_policy
+        self.max_retries = max_retries or self.policy.max_retries
+        self.gate = None
+        self.pages_fetched = 0
+        self.on_result = None
+
+    def run(self, results: List[Dict], on_result=None) -> List[Dict]:
+        """Enrich results with website/email fields
+
+        `on_result` is called with each result as soon as it is enriched,
+        along with the fetched page as (clean_url, html, status), or None
+        when nothing was loaded.
+        """
+        self.on_result = on_result
+        return asyncio.run(self.enrich(results))
+
+    async def enrich(self, results: List[Dict]) -> List[Dict]:
+        from playwright.async_api import async_playwright
+
+        queue = asyncio.Queue()
+        # Workers above the adaptive limit wait here while Xing is throttling
+        self.gate = AdaptiveGate(self.policy.limit)
+        for idx, result in enumerate(results, 1):
+            if result.get("profile_url"):
+                queue.put_nowait((idx, result))
+
+        total_companies = len(results)
+        print(
+            f"\nProcessing contact info for {total_companies} companies "
+            f"({self.concurrency} concurrent)..."
+        )
+        started = time.monotonic()
+
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=self.scraper.headless)
+            try:
+                workers = [
+                    asyncio.create_task(self.worker(browser, queue, total_companies))
+                    for _ in range(min(self.concurrency, queue.qsize() or 1))
+                ]
+                await queue.join()
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+            finally:
+                await browser.close()
+
+        elapsed = time.monotonic() - started
+        rate = self.pages_fetched / (elapsed / 60) if elapsed else 0
+        print(
+            f"\nFinished fetching contact info: {self.pages_fetched} pages in "
+            f"{elapsed:.1f}s ({rate:.1f} pages/min)"
+        )
+        return results
+
+    async def new_page(self, browser):
+        """A fresh context with the saved session and its page"""
+        context = await browser.new_context(**self.scraper.profile_context_options())
+        if self.scraper.resource_filter is not None:
+            await self.scraper.resource_filter.attach_async(context)
+        return context, await context.new_page()
+
+    async def worker(self, browser, queue: asyncio.Queue, total_companies: int):
+        context, page = await self.new_page(browser)
+        navigations = 0
+        try:
+            while True:
+                # Replace the context like BrowserPool does, so renderer
+                # memory doesn't grow over a long run
+                recycle_after = self.scraper.recycle_after
+                if recycle_after and navigations >= recycle_after:
+                    await context.close()
+                    context, page = await self.new_page(browser)
+                    navigations = 0
+                idx, result = await queue.get()
+                navigations += 1
+                fetched = None
+                try:
+                    print(
+                        f"Fetching contact info for {result['company_name']} "
+                        f"({idx}/{total_companies})"
+                    )
+                    with self.scraper.metrics.timer("profile_async"):
+                        contact, fetched = await self.scrape_profile(
+                            page, result["profile_url"]
+                        )
+                        result.update(contact)
+                except Exception as e:
+                    print(f"Error scraping company profile: {str(e)}")
+                finally:
+                    if self.on_result is not None:
+                        self.on_result(result, fetched)
+                    queue.task_done()
+        finally:
+            await context.close()
+
+    async def scrape_profile(self, page, url: str) -> Tuple[Dict[str, str], Tuple]:
+        """Async counterpart of Screpa.fetch_company_profile
+
+        Returns the contact info and the fetched (clean_url, html, status),
+        or ({}, None) when the page didn't load.
+        """
+        clean_url = self.scraper.clean_profile_url(url)
+        async with self.gate:
+            await self.limiter.acquire(clean_url)
+            response = await self.navigate_with_retry(page, clean_url)
+            if not response:
+                return {}, None
+
+            # Wait for the contact section to render
+            ready = True
+            with self.scraper.waits.timed("profile_contact"):
+                try:
+                    await page.wait_for_selector(
+                        PROFILE_READY_SELECTOR, timeout=self.ready_timeout
+                    )
+                except Exception:
+                    self.scraper.waits.timeouts["profile_contact"] += 1
+                    ready = False
+            with self.scraper.metrics.timer("page_content"):
+                html_content = await page.content()
+            self.pages_fetched += 1
+
+        if not self.scraper.is_profile_page(page.url, ready, html_content):
+            return {}, None
+
+        contact = self.scraper.extract_company_contact(html_content)
+        return contact, (clean_url, html_content, response.status)
+
+    async def navigate_with_retry(self, page, url: str):
+        """Async counterpart of Screpa.navigate_with_retry"""
+        policy = self.policy
+        for attempt in range(self.max_retries):
+            await policy.pause_async()
+            response = error = None
+            try:
+                with self.scraper.waits.timed("navigation"):
+                    response = await page.goto(
+                        url, timeout=policy.timeout, wait_until="domcontentloaded"
+                    )
+            except Exception as e:
+                print(f"Navigation attempt {attempt + 1} failed: {str(e)}")
+                error = e
+            outcome, delay = policy.decide(attempt, response, error, self.max_retries)
+            if outcome == OK:
+                return response
+            if response:
+                print(f"Navigation to {url} returned HTTP {response.status}")
+            if delay is None:
+                if error is not None:
+                    raise error
+                return None
+
+            self.scraper.metrics.count("navigation_retries")
+            with self.scraper.metrics.timer("backoff_sleep"):
+                await asyncio.sleep(delay)
+            await self.limiter.acquire(url)
+        return None
@@ -0,0 +1,253 @@
+"""Local HTTP server that mimics the parts of Xing the scraper touches
+
+Serves a login form behind a privacy consent dialog, company search pages
+whose "Show more" button appends result cards, the settings page used as
+the session probe, and company profile pages. Cards and profiles are
+synthetic, or replayed from a results directory (saved search pages and
+the profile cache). Every response can be delayed to mimic network
+latency.
+"""
+
+import html
+import json
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import parsers
+from cache import ProfileCache
+from selector_config import SELECTORS
+
+PAGE_SIZE = 10
+
+# Hashed styled-components class names as served by Xing
+SEARCH_LIST_CLASS = "shared-styles__SearchList-sc-dfa70b15-3"
+SEARCH_CARD_CLASS = "shared-styles__SearchListElement-sc-dfa70b15-4"
+COMPANY_LINK_CLASS = "companies-search-results-styles__CompanyLinkWrapper-sc-5d3cf71d-1"
+COMPANY_NAME_CLASS = "headline-styles__Headline-sc-339d833d-0"
+COMPANY_INFO_CLASS = "body-copy-styles__BodyCopy-sc-b3916c1b-0"
+
+CONSENT_HTML = """<div id="consent" role="dialog">
+<button onclick="document.cookie='consent=1; path=/';
+document.getElementById('consent').remove()">Accept all</button>
+</div>"""
+
+LOGIN_HTML = """<!DOCTYPE html><html><body>{consent}
+<form method="post" action="/login">
+<input name="username"><input name="password" type="password">
+<button type="submit">Log in</button>
+</form></body></html>"""
+
+SEARCH_HTML = """<!DOCTYPE html><html><body>{consent}
+<ol class="{list_class}">{cards}</ol>
+<button id="more">Show more</button>
+<script>
+let offset = {page_size};
+document.getElementById("more").addEventListener("click", async () => {{
+  const params = new URLSearchParams({{keywords: {keyword}, offset}});
+  const response = await fetch("/search/companies/more?" + params);
+  const data = await response.json();
+  document.querySelector("ol").insertAdjacentHTML("beforeend", data.cards);
+  offset += {page_size};
+  if (!data.more) document.getElementById("more").remove();
+}});
+</script></body></html>"""
+
+PROFILE_HTML = """<!DOCTYPE html><html><body><h1>{name}</h1>
+<div class="contact"><a href="https://www.{slug}.example">Website</a>
+<a href="mailto:info@{slug}.example">Email</a></div></body></html>"""
+
+
+def synthetic_card(i: int) -> str:
+    return (
+        f'<li class="{SEARCH_CARD_CLASS}">'
+        f'<a class="{COMPANY_LINK_CLASS}" href="/pages/company-{i}">'
+        f'<h2 class="{COMPANY_NAME_CLASS}">Company {i} GmbH</h2>'
+        f'<p class="{COMPANY_INFO_CLASS}">Berlin, Germany</p>'
+        f'<p class="{COMPANY_INFO_CLASS}">XING members: {i * 7 % 900}</p>'
+        f'<p class="{COMPANY_INFO_CLASS}">Employees: 51-200</p>'
+        "</a></li>"
+    )
+
+
+def recorded_cards(results_dir: Path) -> List[str]:
+    """Result cards from saved search pages, deduplicated by profile link"""
+    cards, seen = [], set()
+    for f in sorted(results_dir.glob("xing_*.html")):
+        soup = parsers.make_soup(f.read_text(encoding="utf-8"), "lxml")
+        for card in SELECTORS.search_card.find_all(soup):
+            link = SELECTORS.company_link.find(card)
+            key = link.get("href") if link else str(card)
+            if key not in seen:
+                seen.add(key)
+                cards.append(str(card))
+    return cards
+
+
+def recorded_profiles(results_dir: Path) -> Dict[str, str]:
+    """Cached profile pages keyed by URL path"""
+    cache_dir = results_dir / "cache"
+    if not cache_dir.exists():
+        return {}
+    cache = ProfileCache(cache_dir, ttl=None, max_bytes=None)
+    try:
+        return {urlsplit(url).path: page for url, page in cache.iter_pages()}
+    finally:
+        cache.close()
+
+
+class FakeXing:
+    """Threaded fake Xing server on 127.0.0.1
+
+    With `results_dir`, saved search cards and cached profiles are served
+    and `companies` is ignored; otherwise `companies` synthetic companies
+    are generated. `latency` seconds are slept before every response.
+    """
+
+    def __init__(
+        self,
+        companies: int = 100,
+        latency: float = 0.05,
+        results_dir: Optional[Path] = None,
+        port: int = 0,
+    ):
+        self.latency = latency
+        self.profiles: Dict[str, str] = {}
+        if results_dir is not None:
+            self.cards = recorded_cards(Path(results_dir))
+            self.profiles = recorded_profiles(Path(results_dir))
+        else:
+            self.cards = [synthetic_card(i) for i in range(companies)]
+        self.requests = 0
+        self._requests_lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def cards_page(self, offset: int) -> str:
+        return "".join(self.cards[offset : offset + PAGE_SIZE])
+
+    def profile(self, path: str) -> str:
+        if path in self.profiles:
+            return self.profiles[path]
+        slug = path.rstrip("/").rsplit("/", 1)[-1]
+        return PROFILE_HTML.format(name=html.escape(slug), slug=html.escape(slug))
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def cookies(self) -> Dict[str, str]:
+                cookie = SimpleCookie(self.headers.get("Cookie", ""))
+                return {key: morsel.value for key, morsel in cookie.items()}
+
+            def send(self, status: int, body: str = "", headers: Dict = None):
+                with fake._requests_lock:
+                    fake.requests += 1
+                if fake.latency:
+                    time.sleep(fake.latency)
+                data = body.encode("utf-8")
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                if "Content-Type" not in (headers or {}):
+                    self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def consent(self) -> str:
+                return "" if "consent" in self.cookies() else CONSENT_HTML
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                self.rfile.read(length)
+                if urlsplit(self.path).path != "/login":
+                    return self.send(404, "Not found")
+                self.send(
+                    302,
+                    headers={"Location": "/", "Set-Cookie": "session=1; Path=/"},
+                )
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                query = parse_qs(parts.query)
+                logged_in = self.cookies().get("session") == "1"
+
+                if parts.path == "/login":
+                    return self.send(200, LOGIN_HTML.format(consent=self.consent()))
+                if not logged_in and parts.path != "/":
+                    return self.send(302, headers={"Location": "/login"})
+
+                if parts.path in ("/", "/settings"):
+                    return self.send(
+                        200, "<!DOCTYPE html><html><body>Home</body></html>"
+                    )
+                if parts.path == "/search/companies":
+                    keyword = query.get("keywords", [""])[0]
+                    return self.send(
+                        200,
+                        SEARCH_HTML.format(
+                            consent=self.consent(),
+                            list_class=SEARCH_LIST_CLASS,
+                            cards=fake.cards_page(0),
+                            keyword=json.dumps(keyword),
+                            page_size=PAGE_SIZE,
+                        ),
+                    )
+                if parts.path == "/search/companies/more":
+                    offset = int(query.get("offset", ["0"])[0])
+                    body = {
+                        "cards": fake.cards_page(offset),
+                        "more": offset + PAGE_SIZE < len(fake.cards),
+                    }
+                    return self.send(
+                        200,
+                        json.dumps(body),
+                        {"Content-Type": "application/json"},
+                    )
+                if parts.path.startswith("/pages/"):
+                    return self.send(200, fake.profile(parts.path))
+                self.send(404, "Not found")
+
+        return Handler
+
+
+if __name__ == "__main__":
+    import sys
+
+    results_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else None
+    with FakeXing(results_dir=results_dir, port=8000) as server:
+        print(f"Fake Xing serving {len(server.cards)} companies on {server.url}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,157 @@
+"""Browserless profile fetching over a pooled HTTP/2 client"""
+
+import threading
+from typing import Dict, List, Optional
+
+import httpx
+
+from retry import TokenBucket
+from selector_config import SELECTORS
+
+
+def has_profile_markup(html: str) -> bool:
+    """Whether a profile page carries the contact markup we extract from
+
+    Looks for the same markers the browser path waits for
+    (waits.PROFILE_READY_SELECTOR) in the raw HTML.
+    """
+    return bool(SELECTORS.profile_markup_re.search(html))
+
+
+class LimitGate:
+    """Let at most `limit.current` requests run at once, as the limit moves
+
+    Thread counterpart of enrich.AdaptiveGate for the HTTP worker threads.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def __enter__(self):
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self.in_flight < max(1, self.limit.current)
+            )
+            self.in_flight += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+
+class HttpProfileFetcher:
+    """Fetch profile HTML with the logged in session's cookies, no browser
+
+    One `httpx.Client` (HTTP/2 when `h2` is installed) is shared by every
+    worker thread so connections are reused. Cached validators are sent as
+    If-None-Match / If-Modified-Since so unchanged profiles come back as an
+    empty 304. Redirects are not followed, a redirect usually means the
+    session was rejected and the browser should handle the page. With a
+    `limit` (retry.AdaptiveLimit), requests in flight follow its value.
+    """
+
+    def __init__(
+        self,
+        cookies: List[Dict],
+        user_agent: str,
+        max_connections: int = 10,
+        rate: float = 0.5,
+        burst: int = 2,
+        timeout: float = 30.0,
+        http2: bool = True,
+        limit=None,
+    ):
+        self.limiter = TokenBucket(rate, burst)
+        self.gate = LimitGate(limit) if limit is not None else None
+        self.fetched = 0
+        self.not_modified = 0
+        self.fallbacks = 0
+        self._stats_lock = threading.Lock()
+
+        jar = httpx.Cookies()
+        for cookie in cookies:
+            jar.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain", ""),
+                path=cookie.get("path", "/"),
+            )
+
+        options = dict(
+            cookies=jar,
+            headers={"User-Agent": user_agent, "Accept": "text/html"},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=timeout,
+            follow_redirects=False,
+        )
+        try:
+            self.client = httpx.Client(http2=http2, **options)
+        except ImportError:
+            print("h2 is not installed, fetching profiles over HTTP/1.1")
+            self.client = httpx.Client(**options)
+
+    def fetch(
+        self, url: str, validators: Optional[Dict[str, str]] = None
+    ) -> Optional[httpx.Response]:
+        """GET a profile, conditionally when validators are given
+
+        Returns None when the request itself failed.
+        """
+        headers = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        self.limiter.acquire()
+        try:
+            if self.gate is not None:
+                with self.gate:
+                    response = self.client.get(url, headers=headers)
+            else:
+                response = self.client.get(url, headers=headers)
+        except httpx.HTTPError as e:
+            print(f"HTTP fetch of {url} failed: {str(e)}")
+            return None
+
+        with self._stats_lock:
+            if response.status_code == 304:
+                self.not_modified += 1
+            else:
+                self.fetched += 1
+        return response
+
+    def record_fallback(self):
+        with self._stats_lock:
+            self.fallbacks += 1
+
+    def print_summary(self):
+        total = self.fetched + self.not_modified
+        if not total and not self.fallbacks:
+            return
+        print(
+            f"HTTP profile fetches: {self.fetched} fetched, "
+            f"{self.not_modified} not modified, "
+            f"{self.fallbacks} fell back to the browser"
+        )
+
+    @property
+    def closed(self) -> bool:
+        return self.client.is_closed
+
+    def add_counts(self, other: "HttpProfileFetcher"):
+        """Carry over the counts of an earlier fetcher"""
+        with self._stats_lock:
+            self.fetched += other.fetched
+            self.not_modified += other.not_modified
+            self.fallbacks += other.fallbacks
+
+    def close(self):
+        self.client.close()
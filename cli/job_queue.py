@@ -0,0 +1,236 @@
+"""Durable SQLite queue of profile enrichment jobs with leases"""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from lead_store import store_key
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobQueue:
+    """Search results waiting to be enriched, shared by worker processes
+
+    A worker claims jobs with a lease. A job whose lease runs out before it
+    is completed (the worker crashed or hung) is handed to the next worker
+    that asks, so no job is lost. Failed attempts are retried with a
+    growing delay until `max_attempts`, then the job is marked failed.
+
+    The database uses SQLite's default rollback journal rather than WAL, so
+    processes on several machines can share it over a network filesystem
+    with working file locks. Claims run in `BEGIN IMMEDIATE` transactions,
+    so two workers never lease the same job.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        lease_seconds: float = 600.0,
+        max_attempts: int = 3,
+        retry_delay: float = 30.0,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+
+        self.db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        self.db.execute("""CREATE TABLE IF NOT EXISTS jobs (
+                key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL,
+                worker TEXT,
+                lease_until REAL,
+                lead TEXT,
+                error TEXT,
+                added REAL NOT NULL,
+                updated REAL NOT NULL
+            )""")
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, available_at)"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _transaction(self):
+        """Take the write lock up front so claims never interleave"""
+        self.db.execute("BEGIN IMMEDIATE")
+        return self.db
+
+    def push(self, results: List[Dict]) -> int:
+        """Queue search results, returning how many were new
+
+        Results already queued (by profile URL) are left alone. Results
+        without a profile URL have nothing to fetch and are done right away.
+        """
+        now = time.time()
+        added = 0
+        db = self._transaction()
+        try:
+            for result in results:
+                key = store_key(result)
+                if not key:
+                    continue
+                status = PENDING if result.get("profile_url") else DONE
+                cursor = db.execute(
+                    "INSERT OR IGNORE INTO jobs (key, result, status, "
+                    "available_at, lead, added, updated) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        json.dumps(dict(result), ensure_ascii=False),
+                        status,
+                        now,
+                        json.dumps(dict(result)) if status == DONE else None,
+                        now,
+                        now,
+                    ),
+                )
+                added += cursor.rowcount
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        return added
+
+    def claim(self, worker: str, limit: int = 1) -> List[Dict]:
+        """Lease up to `limit` jobs to `worker`, returning their results
+
+        Jobs whose lease expired are claimed again, unless they are out of
+        attempts, in which case they are marked failed.
+        """
+        now = time.time()
+        db = self._transaction()
+        try:
+            db.execute(
+                "UPDATE jobs SET status = ?, error = 'lease expired', updated = ? "
+                "WHERE status = ? AND lease_until < ? AND attempts >= ?",
+                (FAILED, now, LEASED, now, self.max_attempts),
+            )
+            rows = db.execute(
+                "SELECT key, result FROM jobs "
+                "WHERE (status = ? AND available_at <= ?) "
+                "OR (status = ? AND lease_until < ?) "
+                "ORDER BY available_at LIMIT ?",
+                (PENDING, now, LEASED, now, max(1, limit)),
+            ).fetchall()
+            db.executemany(
+                "UPDATE jobs SET status = ?, worker = ?, lease_until = ?, "
+                "attempts = attempts + 1, updated = ? WHERE key = ?",
+                [
+                    (LEASED, worker, now + self.lease_seconds, now, key)
+                    for key, _ in rows
+                ],
+            )
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        return [json.loads(result) for _, result in rows]
+
+    def renew(self, worker: str):
+        """Extend the leases `worker` holds, call while it is still working"""
+        now = time.time()
+        self.db.execute(
+            "UPDATE jobs SET lease_until = ?, updated = ? "
+            "WHERE status = ? AND worker = ?",
+            (now + self.lease_seconds, now, LEASED, worker),
+        )
+
+    def complete(self, result: Dict, lead: Dict):
+        """Store the enriched lead of a job
+
+        Accepted even if the lease was lost meanwhile, the work is done.
+        """
+        self.db.execute(
+            "UPDATE jobs SET status = ?, lead = ?, error = NULL, "
+            "lease_until = NULL, updated = ? WHERE key = ? AND status != ?",
+            (
+                DONE,
+                json.dumps(dict(lead), ensure_ascii=False),
+                time.time(),
+                store_key(result),
+                DONE,
+            ),
+        )
+
+    def fail(self, result: Dict, worker: str, error: str):
+        """Record a failed attempt, retrying later while attempts are left
+
+        Ignored unless `worker` still holds the lease, so a worker whose
+        lease ran out can't fail a job another worker is now processing.
+        """
+        now = time.time()
+        key = store_key(result)
+        row = self.db.execute(
+            "SELECT attempts FROM jobs WHERE key = ? AND status = ? AND worker = ?",
+            (key, LEASED, worker),
+        ).fetchone()
+        if row is None:
+            return
+        attempts = row[0]
+        if attempts >= self.max_attempts:
+            status, available_at = FAILED, now
+        else:
+            status = PENDING
+            available_at = now + self.retry_delay * 2 ** (attempts - 1)
+        self.db.execute(
+            "UPDATE jobs SET status = ?, available_at = ?, error = ?, "
+            "lease_until = NULL, updated = ? "
+            "WHERE key = ? AND status = ? AND worker = ?",
+            (status, available_at, error, now, key, LEASED, worker),
+        )
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status"""
+        counts = {status: 0 for status in (PENDING, LEASED, DONE, FAILED)}
+        for status, count in self.db.execute(
+            "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+        ):
+            counts[status] = count
+        return counts
+
+    def unfinished(self) -> int:
+        """Jobs still pending or leased"""
+        counts = self.counts()
+        return counts[PENDING] + counts[LEASED]
+
+    def leads(self) -> Iterator[Dict]:
+        """Enriched leads of every finished job, in the order they were queued"""
+        for (lead,) in self.db.execute(
+            "SELECT lead FROM jobs WHERE status = ? ORDER BY added", (DONE,)
+        ):
+            yield json.loads(lead)
+
+    def failures(self) -> List[Dict]:
+        return [
+            {"key": key, "attempts": attempts, "error": error}
+            for key, attempts, error in self.db.execute(
+                "SELECT key, attempts, error FROM jobs WHERE status = ?", (FAILED,)
+            )
+        ]
+
+    def print_stats(self):
+        counts = self.counts()
+        print(
+            f"Job queue {self.path}: {counts[PENDING]} pending, "
+            f"{counts[LEASED]} leased, {counts[DONE]} done, {counts[FAILED]} failed"
+        )
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
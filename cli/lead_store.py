@@ -0,0 +1,208 @@
+"""SQLite store of every lead seen across runs, with change tracking"""
+
+import csv
+import json
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from cache import normalize_url
+from sinks import LEAD_FIELDS
+
+DAY = 24 * 3600
+
+
+def store_key(lead: Dict) -> str:
+    """Normalized profile URL of a lead, or its company name without one"""
+    if lead.get("profile_url"):
+        return normalize_url(lead["profile_url"])
+    return lead.get("company_name", "")
+
+
+class LeadStore:
+    """Leads upserted by normalized profile URL into an indexed SQLite table
+
+    Each row keeps when the lead was first and last seen, when it was last
+    enriched and which fields changed on its last update. A blank value
+    never overwrites a known one, so a failed enrichment doesn't erase an
+    email found by an earlier run. Each write is its own short transaction
+    in WAL mode, so concurrent runs sharing the store wait for each other
+    briefly instead of failing, and exports can read while a run is writing.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.written = 0
+        self.inserted = 0
+        self.changed = 0
+
+        self.db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        columns = ", ".join(
+            f"{field} TEXT NOT NULL DEFAULT ''" for field in LEAD_FIELDS
+        )
+        self.db.execute(f"""CREATE TABLE IF NOT EXISTS leads (
+                key TEXT PRIMARY KEY,
+                {columns},
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                enriched_at REAL,
+                changed_at REAL,
+                changed_fields TEXT NOT NULL DEFAULT '[]'
+            )""")
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS leads_last_seen ON leads (last_seen)"
+        )
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS leads_enriched_at ON leads (enriched_at)"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Run a write in its own transaction, taking the write lock up front"""
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.db
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+
+    def _row(self, key: str) -> Optional[Dict]:
+        cursor = self.db.execute("SELECT * FROM leads WHERE key = ?", (key,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip([c[0] for c in cursor.description], row))
+
+    def write(self, lead: Dict, enriched: bool = True):
+        """Insert or update a lead
+
+        Pass `enriched=False` for leads whose contact fields were not just
+        fetched, so their enrichment age is left alone.
+        """
+        key = store_key(lead)
+        if not key:
+            return
+        now = time.time()
+        values = {field: str(lead.get(field) or "") for field in LEAD_FIELDS}
+        # Contact fields are only set by a successful profile fetch
+        enriched_at = (
+            now if enriched and ("email" in lead or "website" in lead) else None
+        )
+        # Take the write lock before reading, so a concurrent run can't
+        # update the row between the read and the merge
+        with self._transaction():
+            existing = self._row(key)
+
+            if existing is None:
+                self.db.execute(
+                    f"INSERT INTO leads (key, {', '.join(LEAD_FIELDS)}, first_seen, "
+                    "last_seen, enriched_at) "
+                    f"VALUES (?, {', '.join('?' for _ in LEAD_FIELDS)}, ?, ?, ?)",
+                    (key, *values.values(), now, now, enriched_at),
+                )
+                self.inserted += 1
+            else:
+                changed = [
+                    field
+                    for field, value in values.items()
+                    if value and value != existing[field]
+                ]
+                merged = {
+                    field: value or existing[field] for field, value in values.items()
+                }
+                assignments = ", ".join(f"{field} = ?" for field in LEAD_FIELDS)
+                self.db.execute(
+                    f"UPDATE leads SET {assignments}, last_seen = ?, "
+                    "enriched_at = COALESCE(?, enriched_at), "
+                    "changed_at = CASE WHEN ? THEN ? ELSE changed_at END, "
+                    "changed_fields = CASE WHEN ? THEN ? ELSE changed_fields END "
+                    "WHERE key = ?",
+                    (
+                        *merged.values(),
+                        now,
+                        enriched_at,
+                        bool(changed),
+                        now,
+                        bool(changed),
+                        json.dumps(changed),
+                        key,
+                    ),
+                )
+                if changed:
+                    self.changed += 1
+        self.written += 1
+
+    def split_fresh(
+        self, results: List[Dict], max_age_days: float
+    ) -> Tuple[List[Dict], List[Dict]]:
+        """Split search results into (fresh leads, results to enrich)
+
+        A result is fresh when its profile was enriched within
+        `max_age_days`. Fresh leads are returned with the stored contact
+        fields merged into the current search fields.
+        """
+        cutoff = time.time() - max_age_days * DAY
+        fresh, stale = [], []
+        for result in results:
+            row = self._row(store_key(result)) if result.get("profile_url") else None
+            if row is None or not row["enriched_at"] or row["enriched_at"] < cutoff:
+                stale.append(result)
+                continue
+            lead = {field: row[field] for field in LEAD_FIELDS}
+            lead.update({k: v for k, v in result.items() if v})
+            fresh.append(lead)
+        return fresh, stale
+
+    def query(self, since_days: Optional[float] = None) -> List[Dict]:
+        """Stored leads, optionally only those seen within `since_days`"""
+        sql = f"SELECT {', '.join(LEAD_FIELDS)} FROM leads"
+        params = ()
+        if since_days is not None:
+            sql += " WHERE last_seen >= ?"
+            params = (time.time() - since_days * DAY,)
+        sql += " ORDER BY company_name"
+        return [dict(zip(LEAD_FIELDS, row)) for row in self.db.execute(sql, params)]
+
+    def export_csv(self, filename: str, since_days: Optional[float] = None) -> int:
+        """Write stored leads to a CSV file, returning how many were written"""
+        leads = self.query(since_days)
+        with open(filename, "w", newline="", encoding="utf-8") as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=LEAD_FIELDS)
+            writer.writeheader()
+            writer.writerows(leads)
+        print(f"Exported {len(leads)} leads to {filename}")
+        return len(leads)
+
+    def print_stats(self):
+        total = self.db.execute("SELECT COUNT(*) FROM leads").fetchone()[0]
+        print(
+            f"Lead store: {self.written} leads written ({self.inserted} new, "
+            f"{self.changed} changed), {total} stored in {self.path}"
+        )
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+
+if __name__ == "__main__":
+    # Export the store: python3 lead_store.py [db] [output_csv] [seen_within_days]
+    db_path = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("results/leads.sqlite")
+    output = sys.argv[2] if len(sys.argv) > 2 else "screpa_leads.csv"
+    since_days = float(sys.argv[3]) if len(sys.argv) > 3 else None
+    with LeadStore(db_path) as store:
+        store.export_csv(output, since_days)
@@ -1,109 +1,103 @@
-#!/usr/env python3
-"""Screpa CLI tool"""
+#!/usr/bin/env python3
+"""Screpa CLI tool
 
-from typer import Typer
-from rich import print
-from rich.console import Console
-from rich.table import Table
-import typer
+Every subcommand imports what it needs when it runs, so `export` and
+`cache-stats` start without loading Playwright, BeautifulSoup or httpx.
+Check the import budget with `python3 bench_startup.py`.
+"""
 
-app = Typer()
-console = Console()
+from pathlib import Path
+from typing import Optional
 
-data = {
-    "name": "Rick",
-    "age": 42,
-    "items": [{"name": "Portal Gun"}, {"name": "Plumbus"}],
-    "active": True,
-    "affiliation": None,
-}
+from typer import Argument, Typer
 
-
-@app.command()
-def hello(name: str):
-    """Says Hello to an entity"""
-    print(f"Hello {name}")
+app = Typer(help="Scrape Xing company leads and manage the saved results")
 
 
 @app.command()
-def goodbye(name: str, formal: bool = False):
-    """Say goodbye to an entity
-
-    Args:
-        name (str): Name of an entity
-        formal (bool): Formal or informal?
+def scrape(
+    keyword: str = Argument("real estate"),
+    pages: int = 2,
+    concurrency: int = 1,
+    resume: bool = False,
+    http: bool = False,
+    bounded: bool = False,
+    rich: bool = False,
+    refresh_days: Optional[float] = None,
+    recrawl: bool = False,
+    budget: Optional[int] = None,
+):
+    """Search KEYWORD and enrich every company with its contact info
+
+    Leads are written to screpa_leads.csv and screpa_leads.jsonl.
     """
-    if formal:
-        print(f"Goodbye, Ms. {name}. Have a good day.")
-    else:
-        print(f"Bye {name}!")
+    from screpa import run
+
+    print("Screpa Lead Generator v1.0.0")
+    run(
+        keyword,
+        pages,
+        concurrency,
+        resume=resume,
+        http_fetch=http,
+        bounded_memory=bounded,
+        rich_summary=rich,
+        refresh_days=refresh_days,
+        recrawl=recrawl,
+        fetch_budget=budget,
+    )
 
 
 @app.command()
-def greet(name: str, lastname: str = "", formal: bool = False):
-    """
-    Greet NAME, optionally with a --lastname.
+def reextract(
+    results_dir: Path = Path("results"),
+    output: str = "screpa_leads.csv",
+    workers: Optional[int] = None,
+    parser: str = "lxml",
+):
+    """Rebuild the leads CSV from saved HTML without touching the network"""
+    from reextract import reextract as run_reextract
 
-    If --formal is used, greet very formally.
-    """
-    if formal:
-        print(f"Good day Ms. {name} {lastname}.")
-    else:
-        print(f"Hello {name} {lastname}")
+    run_reextract(results_dir, output, workers, parser_backend=parser)
 
 
 @app.command()
-def printing():
-    """Printing and colors"""
-    print("Here's the data:")
-    print(data)
-
+def export(
+    output: str = "screpa_leads.csv",
+    db: Path = Path("results") / "leads.sqlite",
+    since_days: Optional[float] = None,
+):
+    """Export the lead store to CSV, optionally only recently seen leads"""
+    from lead_store import LeadStore
 
-@app.command()
-def markup():
-    """Custom markup, even emojis! Woah!"""
-    print(
-        "[bold red]Alert![/bold red] [green]Portal gun[/green] shooting! :boom:"
-    )
+    with LeadStore(db) as store:
+        store.export_csv(output, since_days)
 
 
 @app.command()
-def table():
-    """Table printing"""
-    table = Table("Name", "Item")
-    table.add_row("Rick", "Portal Gun")
-    table.add_row("Morty", "Planetina")
-    table.add_row("Summer", "Mr. Meeseeks Box")
-    table.add_row("Sixtus", "Computer")
-    console.print(table)
-
+def normalize(
+    path: Path,
+    output: Optional[str] = None,
+    chunksize: int = 200_000,
+):
+    """Normalize a CSV or JSONL lead export to CSV and Parquet with pandas"""
+    from normalize import normalize_file
 
-@app.command()
-def stderror():
-    """Standard error"""
-    err_console = Console(stderr=True)
-    err_console.print("This is written in standard error")
+    normalize_file(path, output, chunksize)
 
 
 @app.command()
-def typerstyle(good: bool = True):
-    """Combining typer.style() with typer.echo()
-
-    typer.echo() is just click.echo() under the hood
-    """
-    message_start = "Everything is "
-    if good:
-        ending = typer.style("good", fg=typer.colors.GREEN, bold=True)
-    else:
-        ending = typer.style("bad", fg=typer.colors.WHITE, bg=typer.colors.RED)
-    message = message_start + ending
-    typer.echo(message)
+def cache_stats(results_dir: Path = Path("results")):
+    """Print the size of the profile cache"""
+    from cache import ProfileCache
 
-
-@app.command()
-def styleandprint(name: str = "Sixtus"):
-    """Styling and printing with typer.secho()"""
-    typer.secho(f"Welcome here {name}", fg=typer.colors.CYAN, bold=True)
+    cache = ProfileCache(results_dir / "cache", max_bytes=None)
+    stats = cache.stats()
+    cache.close()
+    print(
+        f"Profile cache {results_dir / 'cache'}: {stats['entries']} entries "
+        f"({stats['bytes'] / 1024 / 1024:.1f} MB)"
+    )
 
 
 if __name__ == "__main__":
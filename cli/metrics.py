@@ -0,0 +1,144 @@
+"""Lightweight run instrumentation: stage timers, counters and a run report"""
+
+import functools
+import json
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def peak_rss() -> Dict[str, float]:
+    """Peak resident memory in MB of this process and its reaped children"""
+    try:
+        import resource
+    except ImportError:  # Not available on Windows
+        return {}
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1 / 1024 / 1024 if sys.platform == "darwin" else 1 / 1024
+    return {
+        "self_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+        "children_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale,
+    }
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of `values` (q between 0 and 100)"""
+    ordered = sorted(values)
+    rank = max(1, round(q / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class Metrics:
+    """Durations per stage and named counters for one run
+
+    Safe to share between the main thread, the HTTP worker threads and the
+    async enrichment thread.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.timings = defaultdict(list)
+        self.counters = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            self.timings[name].append(seconds)
+
+    def count(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] += n
+
+    @contextmanager
+    def timer(self, name: str):
+        """Record the duration of the wrapped block under `name`"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Count, total, p50, p95 and max seconds per timer"""
+        with self._lock:
+            timings = {name: list(values) for name, values in self.timings.items()}
+        return {
+            name: {
+                "count": len(values),
+                "total": sum(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "max": max(values),
+            }
+            for name, values in sorted(timings.items())
+            if values
+        }
+
+    def report(self, **extra) -> Dict:
+        """Run report with every timer and counter plus `extra` sections"""
+        finished = time.time()
+        return {
+            "started": self.started,
+            "finished": finished,
+            "elapsed": finished - self.started,
+            "timers": self.summary(),
+            "counters": dict(sorted(self.counters.items())),
+            "peak_rss": peak_rss(),
+            **extra,
+        }
+
+    def write_report(self, path: Path, **extra) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(**extra), f, indent=2)
+        print(f"Saved run report to {path}")
+        return path
+
+    def print_table(self):
+        """Print timers and counters as rich tables"""
+        from rich.console import Console
+        from rich.table import Table
+
+        timers = Table(title="Stage timings (seconds)")
+        for column in ("Stage", "Count", "Total", "p50", "p95", "Max"):
+            timers.add_column(column, justify="left" if column == "Stage" else "right")
+        for name, stats in self.summary().items():
+            timers.add_row(
+                name,
+                str(stats["count"]),
+                f"{stats['total']:.2f}",
+                f"{stats['p50']:.3f}",
+                f"{stats['p95']:.3f}",
+                f"{stats['max']:.3f}",
+            )
+
+        counters = Table(title="Counters")
+        counters.add_column("Counter")
+        counters.add_column("Value", justify="right")
+        for name, value in sorted(self.counters.items()):
+            counters.add_row(name, str(value))
+
+        console = Console()
+        console.print(timers)
+        console.print(counters)
+
+
+def instrumented(name: Optional[str] = None):
+    """Time a method under `name` (default: the method name) in self.metrics"""
+
+    def decorate(func):
+        stage = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.timer(stage):
+                return func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorate
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""Columnar normalization of lead exports with pandas
+
+Parses the raw count strings ("1,001-5,000", "12K", "10,001+") into numeric
+ranges, canonicalizes locations, emails and website domains and dedups
+companies by domain, all with vectorized column operations. The result is
+written to CSV and, when pyarrow is installed, Parquet.
+
+Usage:
+    python3 normalize.py leads.csv|leads.jsonl [output_stem] [chunksize]
+"""
+
+import sys
+from pathlib import Path
+from typing import Callable, Iterator
+
+import pandas as pd
+
+from sinks import LEAD_FIELDS
+
+COUNT_RE = (
+    r"^\s*(?P<low>\d[\d.,]*)\s*(?P<low_unit>[KkMm])?"
+    r"\s*(?:[-–]\s*(?P<high>\d[\d.,]*)\s*(?P<high_unit>[KkMm])?|(?P<plus>\+))?"
+)
+UNITS = {"K": 1_000, "M": 1_000_000}
+EMAIL_RE = r"^[^@\s]+@[a-z0-9.-]+\.[a-z]{2,}$"
+COUNTRY_NAMES = {
+    "deutschland": "Germany",
+    "germany": "Germany",
+    "österreich": "Austria",
+    "austria": "Austria",
+    "schweiz": "Switzerland",
+    "switzerland": "Switzerland",
+    "niederlande": "Netherlands",
+    "netherlands": "Netherlands",
+    "usa": "USA",
+    "uk": "UK",
+}
+# Words of a location, with inner apostrophes ("Val d'Isère")
+WORD_RE = r"[^\W\d_]+(?:['’][^\W\d_]+)*"
+# Lowercase particles inside place names ("Frankfurt am Main")
+PARTICLES = {"am", "an", "auf", "bei", "d", "de", "der", "im", "in", "ob", "on", "upon"}
+
+
+def _to_number(digits: pd.Series, unit: pd.Series) -> pd.Series:
+    """Numbers from digit strings with thousands separators and K/M units"""
+    digits = digits.str.replace(",", "", regex=False)
+    # "1.234" is a German thousands separator, "1.5K" a decimal point
+    grouped = digits.str.fullmatch(r"\d{1,3}(?:\.\d{3})+", na=False) & unit.isna()
+    digits = digits.mask(grouped, digits.str.replace(".", "", regex=False))
+    scale = unit.str.upper().map(UNITS).fillna(1)
+    return pd.to_numeric(digits, errors="coerce") * scale
+
+
+def parse_counts(values: pd.Series) -> pd.DataFrame:
+    """Split count strings into nullable integer `min` and `max` columns
+
+    A single number is its own range, an open range ("10,001+") has no
+    max, and anything unparseable is missing on both ends.
+    """
+    parts = values.astype("string").str.extract(COUNT_RE)
+    low = _to_number(parts["low"], parts["low_unit"])
+    # "1-5K" means 1,000-5,000, the unit applies to both ends
+    high_unit = parts["high_unit"]
+    low = low.mask(
+        parts["low_unit"].isna() & high_unit.notna(),
+        _to_number(parts["low"], high_unit),
+    )
+    high = _to_number(parts["high"], high_unit).fillna(low)
+    high = high.mask(parts["plus"].notna())
+    return pd.DataFrame(
+        {"min": low.round().astype("Int64"), "max": high.round().astype("Int64")}
+    )
+
+
+def _word_case(match) -> str:
+    """Capitalize lowercase or shouted words, keep acronyms and mixed case"""
+    word = match.group(0)
+    if word.lower() in PARTICLES and match.start() > 0 and word.islower():
+        return word
+    if word.islower() or (word.isupper() and len(word) > 3):
+        return word.capitalize()
+    return word
+
+
+def canonical_locations(values: pd.Series) -> pd.DataFrame:
+    """Tidy location text and split it into city, region and country"""
+    location = (
+        values.astype("string")
+        .str.replace(r"\s+", " ", regex=True)
+        .str.replace(r"\s*,\s*", ", ", regex=True)
+        .str.strip(" ,.;")
+        .str.replace(WORD_RE, _word_case, regex=True)
+    )
+    parts = location.str.split(", ")
+    single = parts.str.len() == 1
+    last = parts.str[-1].astype("string")
+    country = last.str.lower().map(COUNTRY_NAMES).astype("string")
+    # A lone country name ("UK") has no city
+    city = parts.str[0].astype("string").mask(single & country.notna())
+    region = parts.str[1:-1].str.join(", ").astype("string").replace("", pd.NA)
+    # An unknown last part is still the country when the text has two parts
+    country = country.fillna(last.where(~single))
+    location = (
+        city.fillna("") + (", " + region).fillna("") + (", " + country).fillna("")
+    ).str.strip(", ")
+    return pd.DataFrame(
+        {"location": location, "city": city, "region": region, "country": country}
+    )
+
+
+def canonical_emails(values: pd.Series) -> pd.DataFrame:
+    """Lowercased, decoded emails (blank when invalid) and their domains"""
+    email = (
+        values.astype("string")
+        .str.strip()
+        .str.lower()
+        .str.replace(r"^mailto:", "", regex=True)
+        .str.replace("%40", "@", regex=False)
+        .str.split(r"[?&#]", n=1, regex=True)
+        .str[0]
+        .astype("string")
+    )
+    email = email.where(email.str.fullmatch(EMAIL_RE, na=False), "")
+    domain = email.str.split("@").str[1].astype("string")
+    return pd.DataFrame({"email": email, "email_domain": domain})
+
+
+def website_domains(values: pd.Series) -> pd.Series:
+    """Registrable host of each website, without scheme, www, port or path"""
+    return (
+        values.astype("string")
+        .str.strip()
+        .str.lower()
+        .str.replace(r"^[a-z][a-z0-9+.-]*://", "", regex=True)
+        .str.replace(r"^www\d*\.", "", regex=True)
+        .str.split(r"[/:?#]", n=1, regex=True)
+        .str[0]
+        .astype("string")
+        .replace("", pd.NA)
+    )
+
+
+def on_uniques(func: Callable, values: pd.Series):
+    """Apply a column transform to the distinct values only, then broadcast
+
+    Count ranges, locations and even domains repeat across millions of
+    leads, so parsing each distinct string once is far cheaper.
+    """
+    codes, uniques = pd.factorize(values.fillna(""))
+    result = func(pd.Series(uniques, dtype="string"))
+    return result.iloc[codes].set_axis(values.index)
+
+
+def normalize_chunk(leads: pd.DataFrame) -> pd.DataFrame:
+    """Normalize one batch of leads, adding the parsed columns"""
+    leads = leads.reindex(columns=list(dict.fromkeys([*LEAD_FIELDS, *leads.columns])))
+    leads = leads.astype("string")
+    members = on_uniques(parse_counts, leads["xing_members"])
+    employees = on_uniques(parse_counts, leads["employee_count"])
+    locations = on_uniques(canonical_locations, leads["location"])
+    emails = on_uniques(canonical_emails, leads["email"])
+
+    leads["company_name"] = leads["company_name"].str.strip()
+    leads["xing_members_min"] = members["min"]
+    leads["xing_members_max"] = members["max"]
+    leads["employees_min"] = employees["min"]
+    leads["employees_max"] = employees["max"]
+    leads["location"] = locations["location"]
+    leads["city"] = locations["city"]
+    leads["region"] = locations["region"]
+    leads["country"] = locations["country"]
+    leads["email"] = emails["email"]
+    leads["email_domain"] = emails["email_domain"]
+    leads["domain"] = on_uniques(website_domains, leads["website"])
+    return leads
+
+
+def dedupe_by_domain(leads: pd.DataFrame) -> pd.DataFrame:
+    """Keep the most complete lead per domain, and every lead without one"""
+    filled = (
+        leads[LEAD_FIELDS].fillna("").ne("").sum(axis=1)
+        + leads["xing_members_min"].notna()
+    )
+    ranked = leads.assign(_filled=filled.to_numpy()).sort_values(
+        "_filled", ascending=False, kind="stable"
+    )
+    has_domain = ranked["domain"].notna()
+    keep = ~has_domain | ~ranked.duplicated("domain")
+    return ranked[keep].sort_index().drop(columns="_filled")
+
+
+def read_chunks(path: Path, chunksize: int = 200_000) -> Iterator[pd.DataFrame]:
+    """Read a CSV or JSON Lines lead export in batches of `chunksize` rows"""
+    if path.suffix == ".jsonl":
+        yield from pd.read_json(path, lines=True, dtype=False, chunksize=chunksize)
+    else:
+        yield from pd.read_csv(
+            path, dtype=str, keep_default_na=False, chunksize=chunksize
+        )
+
+
+def normalize_file(
+    path: Path, output_stem: str = None, chunksize: int = 200_000
+) -> pd.DataFrame:
+    """Normalize a lead export and write it to CSV and Parquet"""
+    path = Path(path)
+    output_stem = output_stem or f"{path.with_suffix('')}_normalized"
+    chunks = [normalize_chunk(chunk) for chunk in read_chunks(path, chunksize)]
+    if not chunks:
+        print(f"No leads in {path}")
+        return pd.DataFrame(columns=LEAD_FIELDS)
+
+    leads = pd.concat(chunks, ignore_index=True)
+    total = len(leads)
+    leads = dedupe_by_domain(leads).reset_index(drop=True)
+    print(
+        f"Normalized {total} leads, {total - len(leads)} duplicates by domain "
+        f"removed, {len(leads)} left"
+    )
+
+    leads.to_csv(f"{output_stem}.csv", index=False)
+    print(f"Saved {output_stem}.csv")
+    try:
+        leads.to_parquet(f"{output_stem}.parquet", index=False)
+        print(f"Saved {output_stem}.parquet")
+    except ImportError:
+        print("pyarrow is not installed, skipping the Parquet export")
+    return leads
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(
+            "Usage: python3 normalize.py leads.csv|leads.jsonl [output_stem] [chunksize]"
+        )
+        exit(1)
+    output_stem = sys.argv[2] if len(sys.argv) > 2 else None
+    chunksize = int(sys.argv[3]) if len(sys.argv) > 3 else 200_000
+    normalize_file(Path(sys.argv[1]), output_stem, chunksize)
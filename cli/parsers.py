@@ -0,0 +1,175 @@
+"""HTML parser backends for the Screpa extractors
+
+Available backends:
+
+- "html.parser": BeautifulSoup with Python's built-in parser (slowest)
+- "lxml": BeautifulSoup on top of lxml
+- "strainer": lxml restricted by a SoupStrainer to the part of the page the
+  extractor reads (the search result list). Profile pages are parsed in full
+  because website links are looked up relative to the email link's parent.
+- "selectolax": selectolax's Lexbor/Modest fast path, if installed
+
+All backends produce the same dicts as the original html.parser extractors
+and read their selectors from selector_config.
+"""
+
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from selector_config import SELECTORS
+
+BACKENDS = ("html.parser", "lxml", "strainer", "selectolax")
+
+# Strainers see the raw class attribute string, the class regex handles both
+SEARCH_LIST_STRAINER = SoupStrainer(
+    SELECTORS.search_list.tag, {"class": SELECTORS.search_list.class_re}
+)
+
+
+def selectolax_parser():
+    """Return selectolax's Lexbor parser, or the legacy Modest parser"""
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+
+        return LexborHTMLParser
+    except ImportError:
+        from selectolax.parser import HTMLParser
+
+        return HTMLParser
+
+
+def check_backend(backend: str) -> str:
+    """Validate a backend name, falling back when its library is missing"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown parser backend: {backend}")
+    if backend == "selectolax":
+        try:
+            import selectolax  # noqa: F401
+        except ImportError:
+            print("selectolax is not installed, falling back to lxml parser")
+            backend = "lxml"
+    if backend in ("lxml", "strainer"):
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            print("lxml is not installed, falling back to html.parser")
+            backend = "html.parser"
+    return backend
+
+
+def make_soup(html: str, backend: str, parse_only: Optional[SoupStrainer] = None):
+    """Build a BeautifulSoup tree for a BeautifulSoup based backend"""
+    if backend == "html.parser":
+        return BeautifulSoup(html, "html.parser")
+    if backend == "strainer" and parse_only is not None:
+        return BeautifulSoup(html, "lxml", parse_only=parse_only)
+    return BeautifulSoup(html, "lxml")
+
+
+def apply_info_text(result_info: Dict[str, str], text: str):
+    """Assign a result card info paragraph to the matching field"""
+    if "XING members:" in text:
+        result_info["xing_members"] = text.split("XING members:")[1].strip()
+    elif "Employees:" in text:
+        result_info["employee_count"] = text.split("Employees:")[1].strip()
+    elif text and ":" not in text:  # Location has no label
+        result_info["location"] = text
+
+
+def selectolax_search_results(html: str, base_url: str) -> List[Dict]:
+    """selectolax version of Screpa.extract_search_results"""
+    HTMLParser = selectolax_parser()
+    results = []
+    results_section = HTMLParser(html).css_first(SELECTORS.search_list.css)
+    if results_section is None:
+        print("No results section found")
+        return results
+
+    company_cards = results_section.css(SELECTORS.search_card.css)
+    print(f"Found {len(company_cards)} company cards")
+    return selectolax_cards(company_cards, base_url)
+
+
+def selectolax_card_fragments(html: str, base_url: str) -> List[Dict]:
+    """selectolax version of Screpa.extract_card_fragments"""
+    HTMLParser = selectolax_parser()
+    return selectolax_cards(HTMLParser(html).css(SELECTORS.search_card.css), base_url)
+
+
+def selectolax_cards(company_cards, base_url: str) -> List[Dict]:
+    """selectolax version of Screpa.extract_cards"""
+    results = []
+    for card in company_cards:
+        result_info = {
+            "company_name": "",
+            "xing_members": "",
+            "location": "",
+            "employee_count": "",
+            "profile_url": "",
+        }
+
+        try:
+            link = card.css_first(SELECTORS.company_link.css)
+            if link is not None:
+                result_info["profile_url"] = base_url + link.attributes.get("href")
+
+            name_tag = card.css_first(SELECTORS.company_name.css)
+            if name_tag is not None:
+                result_info["company_name"] = name_tag.text().strip()
+
+            for p in card.css(SELECTORS.company_info.css):
+                apply_info_text(result_info, p.text().strip())
+
+            # Only add if we have at least a name
+            if result_info["company_name"]:
+                results.append(result_info)
+
+        except Exception as e:
+            print(f"Error processing card: {str(e)}")
+            continue
+
+    return results
+
+
+def selectolax_company_contact(html: str) -> Dict[str, str]:
+    """selectolax version of Screpa.extract_company_contact"""
+    HTMLParser = selectolax_parser()
+    contact_info = {
+        "website": "",
+        "email": "",
+    }
+
+    try:
+        tree = HTMLParser(html)
+
+        email_link = tree.css_first('a[href^="mailto:"]')
+        if email_link is not None:
+            email = email_link.attributes["href"].replace("mailto:", "").strip()
+            email = email.split("?")[0].split("&")[0]
+            contact_info["email"] = email
+            print(f"Found email ${email}")
+
+            website_links = [
+                a
+                for a in email_link.parent.css("a[href]")
+                if SELECTORS.website_re.match(a.attributes["href"] or "")
+            ]
+            if website_links:
+                website = website_links[0].attributes["href"].strip()
+                contact_info["website"] = website
+                print(f"Found paired email/website: {email} / {website}")
+                return contact_info
+
+        for a in tree.css("a[href]"):
+            href = a.attributes["href"]
+            if href and SELECTORS.www_website_re.match(href):
+                website = href.strip()
+                contact_info["website"] = website
+                print(f"Found website: {website}")
+                break
+
+    except Exception as e:
+        print(f"Error extracting contact info: {str(e)}")
+
+    return contact_info
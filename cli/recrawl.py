@@ -0,0 +1,233 @@
+"""Change-detection recrawl scheduling for company profiles"""
+
+import hashlib
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from lead_store import DAY, store_key
+
+CONTACT_FIELDS = ("email", "website")
+
+
+def contact_fingerprint(contact: Dict) -> str:
+    """SHA-256 of the normalized contact block of a profile"""
+    block = "\n".join(
+        str(contact.get(field) or "").strip().lower() for field in CONTACT_FIELDS
+    )
+    return hashlib.sha256(block.encode("utf-8")).hexdigest()
+
+
+class RecrawlScheduler:
+    """Decide which profiles to fetch again, and when
+
+    Each profile keeps the fingerprint of its last extracted contact block
+    and its own revisit interval. A fetch that finds the same contact info
+    stretches the interval by `backoff` (up to `max_interval_days`), a
+    change halves it (down to `min_interval_days`), so profiles that never
+    change are visited rarely and volatile ones often.
+
+    Within a run at most `budget` profiles are fetched: new profiles first,
+    then due profiles by how recently they changed and how overdue they
+    are. Everything else is served from the stored contact block.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        initial_interval_days: float = 7.0,
+        min_interval_days: float = 1.0,
+        max_interval_days: float = 90.0,
+        backoff: float = 1.5,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.initial_interval = initial_interval_days * DAY
+        self.min_interval = min_interval_days * DAY
+        self.max_interval = max_interval_days * DAY
+        self.backoff = backoff
+        self.planned = 0
+        self.reused = 0
+        self.over_budget = 0
+        self.unchanged = 0
+        self.changed = 0
+        self.new = 0
+
+        self.db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS profiles (
+                key TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                email TEXT NOT NULL DEFAULT '',
+                website TEXT NOT NULL DEFAULT '',
+                first_fetched REAL NOT NULL,
+                last_fetched REAL NOT NULL,
+                last_changed REAL,
+                interval REAL NOT NULL,
+                next_due REAL NOT NULL,
+                fetches INTEGER NOT NULL DEFAULT 1,
+                changes INTEGER NOT NULL DEFAULT 0
+            )""")
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS profiles_next_due ON profiles (next_due)"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Run a write in its own transaction, taking the write lock up front"""
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.db
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+
+    def _row(self, key: str) -> Optional[Dict]:
+        cursor = self.db.execute("SELECT * FROM profiles WHERE key = ?", (key,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip([c[0] for c in cursor.description], row))
+
+    def plan(
+        self, results: List[Dict], budget: Optional[int] = None
+    ) -> Tuple[List[Dict], List[Dict]]:
+        """Split search results into (results to fetch, leads to reuse)
+
+        Results without a profile URL have nothing to fetch and go with the
+        results to fetch, which passes them through unchanged. Reused
+        leads carry their stored contact block, except new profiles left
+        over the budget, which are first in line next run.
+        """
+        now = time.time()
+        fetch, candidates, reuse = [], [], []
+        for result in results:
+            if not result.get("profile_url"):
+                fetch.append(result)
+                continue
+            row = self._row(store_key(result))
+            if row is not None and row["next_due"] > now:
+                reuse.append(dict(result, email=row["email"], website=row["website"]))
+                continue
+            candidates.append((result, row))
+
+        def priority(candidate):
+            _, row = candidate
+            if row is None:
+                return (0, 0.0, 0.0)
+            # Recently changed first, then the most overdue
+            return (1, -(row["last_changed"] or 0.0), row["next_due"])
+
+        candidates.sort(key=priority)
+        if budget is not None:
+            for result, row in candidates[budget:]:
+                self.over_budget += 1
+                if row is None:
+                    reuse.append(result)
+                else:
+                    reuse.append(
+                        dict(result, email=row["email"], website=row["website"])
+                    )
+            candidates = candidates[:budget]
+
+        fetch.extend(result for result, _ in candidates)
+        self.planned += len(candidates)
+        self.reused += len(reuse)
+        return fetch, reuse
+
+    def record(self, lead: Dict):
+        """Update a profile's fingerprint and interval after a fetch
+
+        Leads without contact fields (the page didn't load) are ignored, so
+        the profile stays due.
+        """
+        if not lead.get("profile_url") or not any(f in lead for f in CONTACT_FIELDS):
+            return
+        now = time.time()
+        key = store_key(lead)
+        fingerprint = contact_fingerprint(lead)
+        contact = (lead.get("email") or "", lead.get("website") or "")
+        with self._transaction():
+            row = self._row(key)
+
+            if row is None:
+                self.new += 1
+                self.db.execute(
+                    "INSERT INTO profiles (key, fingerprint, email, website, "
+                    "first_fetched, last_fetched, interval, next_due) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        fingerprint,
+                        *contact,
+                        now,
+                        now,
+                        self.initial_interval,
+                        now + self.initial_interval,
+                    ),
+                )
+            else:
+                changed = fingerprint != row["fingerprint"]
+                if changed:
+                    self.changed += 1
+                    interval = max(self.min_interval, row["interval"] / 2)
+                else:
+                    self.unchanged += 1
+                    interval = min(self.max_interval, row["interval"] * self.backoff)
+                self.db.execute(
+                    "UPDATE profiles SET fingerprint = ?, email = ?, website = ?, "
+                    "last_fetched = ?, last_changed = CASE WHEN ? THEN ? "
+                    "ELSE last_changed END, interval = ?, next_due = ?, "
+                    "fetches = fetches + 1, changes = changes + ? WHERE key = ?",
+                    (
+                        fingerprint,
+                        *contact,
+                        now,
+                        changed,
+                        now,
+                        interval,
+                        now + interval,
+                        int(changed),
+                        key,
+                    ),
+                )
+
+    def stats(self) -> Dict[str, int]:
+        due = self.db.execute(
+            "SELECT COUNT(*) FROM profiles WHERE next_due <= ?", (time.time(),)
+        ).fetchone()[0]
+        tracked = self.db.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+        return {
+            "planned": self.planned,
+            "reused": self.reused,
+            "over_budget": self.over_budget,
+            "new": self.new,
+            "changed": self.changed,
+            "unchanged": self.unchanged,
+            "tracked": tracked,
+            "due": due,
+        }
+
+    def print_summary(self):
+        stats = self.stats()
+        print(
+            f"Recrawl: {stats['planned']} profiles fetched ({stats['new']} new, "
+            f"{stats['changed']} changed, {stats['unchanged']} unchanged), "
+            f"{stats['reused']} reused ({stats['over_budget']} over budget); "
+            f"{stats['tracked']} tracked, {stats['due']} due now"
+        )
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
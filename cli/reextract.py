@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Rebuild the leads CSV from saved HTML without touching the network
+
+Search pages (xing_search_*.html) are re-parsed for company cards and the
+cached profile pages in results/cache are re-parsed for contact info, both
+spread over a process pool. Use this after changing an extractor instead of
+re-scraping everything.
+
+Usage:
+    python3 reextract.py [results_dir] [output_csv] [workers]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from cache import ProfileCache, normalize_url, read_page
+from screpa import Screpa
+
+_scraper = None
+
+
+def _init_worker(parser_backend: str, results_dir: Path):
+    """Build one extractor per worker process and silence per-page prints"""
+    global _scraper
+    sys.stdout = open(os.devnull, "w")
+    _scraper = Screpa(parser_backend=parser_backend, results_dir=results_dir)
+
+
+def _extract_search_file(filepath: Path) -> List[Dict]:
+    try:
+        return _scraper.extract_search_results(filepath.read_text(encoding="utf-8"))
+    except Exception as e:
+        print(f"Error re-extracting {filepath}: {str(e)}", file=sys.stderr)
+        return []
+
+
+def _extract_profile(
+    entry: Tuple[str, Path, Optional[str]],
+) -> Tuple[str, Dict[str, str]]:
+    url, filepath, compression = entry
+    try:
+        return url, _scraper.extract_company_contact(read_page(filepath, compression))
+    except Exception as e:
+        print(f"Error re-extracting {filepath}: {str(e)}", file=sys.stderr)
+        return url, {}
+
+
+def reextract(
+    results_dir: Path = Path("results"),
+    output: str = "screpa_leads.csv",
+    workers: int = None,
+    chunksize: int = 64,
+    parser_backend: str = "lxml",
+) -> List[Dict]:
+    """Re-run the extractors over the saved corpus and rebuild the leads CSV"""
+    started = time.monotonic()
+    search_files = sorted(results_dir.glob("xing_search_*.html"))
+    cached_profiles = {}
+    if (results_dir / "cache" / "index.sqlite").exists():
+        cache = ProfileCache(results_dir / "cache", max_bytes=None)
+        cached_profiles = cache.entries()
+        cache.close()
+
+    scraper = Screpa(parser_backend=parser_backend, results_dir=results_dir)
+    legacy_profiles = len(list(results_dir.glob("company_*.html")))
+    if legacy_profiles:
+        print(
+            f"Skipping {legacy_profiles} legacy company_*.html pages "
+            "(their names don't identify the profile URL)"
+        )
+
+    print(
+        f"Re-extracting {len(search_files)} search pages and "
+        f"{len(cached_profiles)} cached profiles..."
+    )
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(scraper.parser_backend, results_dir),
+    ) as executor:
+        # Search pages are few and large, so hand them out one at a time.
+        # They overlap as "Show more" appends, so dedup by profile URL.
+        all_results = []
+        seen_keys = set()
+        for page_results in executor.map(_extract_search_file, search_files):
+            scraper.merge_new_results(all_results, page_results, seen_keys)
+
+        wanted = {}
+        for result in all_results:
+            if result["profile_url"]:
+                url = normalize_url(scraper.clean_profile_url(result["profile_url"]))
+                if url in cached_profiles:
+                    wanted[url] = (url, *cached_profiles[url])
+
+        contacts = dict(
+            executor.map(_extract_profile, wanted.values(), chunksize=chunksize)
+        )
+
+    for result in all_results:
+        if result["profile_url"]:
+            url = normalize_url(scraper.clean_profile_url(result["profile_url"]))
+            result.update(contacts.get(url, {}))
+
+    scraper.save_to_csv(all_results, output)
+    elapsed = time.monotonic() - started
+    pages = len(search_files) + len(wanted)
+    print(
+        f"Re-extracted {len(all_results)} leads ({len(wanted)} with cached "
+        f"profiles) from {pages} pages in {elapsed:.1f}s "
+        f"({pages / elapsed if elapsed else 0:.1f} pages/sec), saved to {output}"
+    )
+    return all_results
+
+
+if __name__ == "__main__":
+    results_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("results")
+    output = sys.argv[2] if len(sys.argv) > 2 else "screpa_leads.csv"
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    reextract(results_dir, output, workers)
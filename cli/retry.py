@@ -0,0 +1,326 @@
+"""Retry policy for page loads: classification, backoff, circuit breaker,
+adaptive concurrency and request pacing"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+# Outcomes of one attempt
+OK = "ok"
+RETRY = "retry"  # Transient: timeouts, 5xx, dropped connections
+THROTTLE = "throttle"  # The server asked us to slow down (429, 503)
+NETWORK = "network"  # Our side can't reach the host (DNS, no route)
+FAIL = "fail"  # Permanent, retrying won't help (404, 410, too many redirects)
+
+NETWORK_ERRORS = (
+    "ERR_NAME_NOT_RESOLVED",
+    "ERR_INTERNET_DISCONNECTED",
+    "ERR_ADDRESS_UNREACHABLE",
+    "ERR_NETWORK_CHANGED",
+)
+PERMANENT_ERRORS = ("ERR_TOO_MANY_REDIRECTS", "ERR_INVALID_URL", "ERR_BLOCKED")
+
+
+def classify_status(status: int) -> str:
+    if status < 400:
+        return OK
+    if status in (429, 503):
+        return THROTTLE
+    if status in (408, 425) or status >= 500:
+        return RETRY
+    return FAIL
+
+
+def classify_error(error: Exception) -> str:
+    message = str(error)
+    if any(code in message for code in NETWORK_ERRORS):
+        return NETWORK
+    if any(code in message for code in PERMANENT_ERRORS):
+        return FAIL
+    return RETRY
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta seconds or HTTP date)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def response_status(response) -> Optional[int]:
+    """Status of a Playwright (`.status`) or httpx (`.status_code`) response"""
+    if response is None:
+        return None
+    return getattr(response, "status_code", None) or response.status
+
+
+class TokenBucket:
+    """Token bucket refilling `rate` tokens per second, holding up to `capacity`
+
+    `reserve` takes a token now and says how long to wait before using it,
+    so threads sleep with `time.sleep` and coroutines with `asyncio.sleep`.
+    Waiters are served in order since each reservation is paid up front.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token, return the seconds to wait before it is available"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= 1
+            return max(0.0, -self.tokens / self.rate)
+
+    def acquire(self):
+        """Block until a token is available and take it"""
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+
+class CircuitBreaker:
+    """Pause every request while the recent error rate is too high
+
+    Opens when at least `threshold` of the last `window` attempts failed
+    (with at least `min_samples` attempts seen). While open, callers wait
+    out the cooldown. The first attempt after it is a probe: success closes
+    the breaker, failure reopens it with twice the cooldown (up to
+    `max_cooldown`).
+    """
+
+    def __init__(
+        self,
+        window: int = 20,
+        threshold: float = 0.5,
+        min_samples: int = 10,
+        cooldown: float = 60.0,
+        max_cooldown: float = 900.0,
+    ):
+        self.outcomes = deque(maxlen=window)
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.open_until = 0.0
+        self.half_open = False
+        self.trips = 0
+
+    def remaining(self) -> float:
+        """Seconds until requests may resume, 0 when closed"""
+        return max(0.0, self.open_until - time.monotonic())
+
+    def record(self, success: bool):
+        if self.remaining():
+            return  # Requests started before the breaker opened
+        if self.half_open:
+            self.half_open = False
+            if success:
+                self.cooldown = self.base_cooldown
+                self.outcomes.clear()
+            else:
+                self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+                self._trip()
+            return
+
+        self.outcomes.append(success)
+        failures = self.outcomes.count(False)
+        if (
+            len(self.outcomes) >= self.min_samples
+            and failures / len(self.outcomes) >= self.threshold
+        ):
+            self._trip()
+
+    def _trip(self):
+        self.trips += 1
+        self.open_until = time.monotonic() + self.cooldown
+        self.half_open = True
+        self.outcomes.clear()
+        print(
+            f"Circuit breaker open: error rate too high, pausing requests "
+            f"for {self.cooldown:.0f}s"
+        )
+
+
+class AdaptiveLimit:
+    """AIMD concurrency limit: +1 per window of successes, halved on throttling"""
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = None):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum or initial)
+        self.value = float(min(max(initial, self.minimum), self.maximum))
+        self.decreases = 0
+        self.lowest = self.value
+
+    @property
+    def current(self) -> int:
+        return int(self.value)
+
+    def on_success(self):
+        self.value = min(self.maximum, self.value + 1 / self.value)
+
+    def on_throttle(self):
+        self.value = max(self.minimum, self.value / 2)
+        self.decreases += 1
+        self.lowest = min(self.lowest, self.value)
+
+
+class RetryPolicy:
+    """Decides whether and how long to wait before retrying a page load
+
+    Delays grow exponentially from `base_delay` with full jitter, capped at
+    `max_delay`; throttling responses start from a higher base and honour
+    Retry-After. Every outcome feeds the circuit breaker and the adaptive
+    concurrency limit. Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 2.0,
+        max_delay: float = 120.0,
+        throttle_delay: float = 15.0,
+        timeout: int = 30000,
+        concurrency: int = 1,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.throttle_delay = throttle_delay
+        self.timeout = timeout  # Per attempt, in milliseconds
+        self.breaker = breaker or CircuitBreaker()
+        self.limit = AdaptiveLimit(concurrency)
+        self.outcomes = defaultdict(int)
+        self.retries = 0
+        self.retry_after_honoured = 0
+        self.backoff_seconds = 0.0
+        self.paused_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def should_retry(
+        self, outcome: str, attempt: int, max_retries: Optional[int] = None
+    ) -> bool:
+        """Whether another attempt may follow attempt number `attempt` (from 0)"""
+        max_retries = max_retries or self.max_retries
+        return outcome not in (OK, FAIL) and attempt < max_retries - 1
+
+    def decide(
+        self,
+        attempt: int,
+        response=None,
+        error: Optional[Exception] = None,
+        max_retries: Optional[int] = None,
+    ) -> Tuple[str, Optional[float]]:
+        """Classify and record an attempt, return (outcome, retry delay or None)"""
+        status = response_status(response)
+        if error is not None:
+            outcome = classify_error(error)
+        elif status is None:
+            outcome = RETRY
+        else:
+            outcome = classify_status(status)
+        self.record(outcome)
+        if not self.should_retry(outcome, attempt, max_retries):
+            return outcome, None
+        retry_after = None
+        if status is not None:
+            retry_after = parse_retry_after(response.headers.get("retry-after"))
+        return outcome, self.delay(attempt, outcome, retry_after)
+
+    def record(self, outcome: str):
+        """Record the outcome of one attempt"""
+        with self._lock:
+            self.outcomes[outcome] += 1
+            self.breaker.record(outcome in (OK, FAIL))
+            if outcome == OK:
+                self.limit.on_success()
+            elif outcome == THROTTLE:
+                self.limit.on_throttle()
+
+    def delay(
+        self, attempt: int, outcome: str, retry_after: Optional[float] = None
+    ) -> float:
+        """Seconds to wait before retry number `attempt + 1`"""
+        with self._lock:
+            self.retries += 1
+            if retry_after is not None:
+                self.retry_after_honoured += 1
+                delay = min(retry_after, self.max_delay)
+            else:
+                base = self.throttle_delay if outcome == THROTTLE else self.base_delay
+                if outcome == NETWORK:
+                    base *= 4  # Give DNS or the connection time to come back
+                delay = random.uniform(0, min(self.max_delay, base * 2**attempt))
+            self.backoff_seconds += delay
+        return delay
+
+    def _pause_time(self) -> float:
+        remaining = self.breaker.remaining()
+        if remaining:
+            with self._lock:
+                self.paused_seconds += remaining
+        return remaining
+
+    def pause(self):
+        """Block while the circuit breaker is open"""
+        remaining = self._pause_time()
+        if remaining:
+            time.sleep(remaining)
+
+    async def pause_async(self):
+        remaining = self._pause_time()
+        if remaining:
+            await asyncio.sleep(remaining)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "outcomes": dict(self.outcomes),
+                "retries": self.retries,
+                "retry_after_honoured": self.retry_after_honoured,
+                "backoff_seconds": round(self.backoff_seconds, 2),
+                "breaker_trips": self.breaker.trips,
+                "paused_seconds": round(self.paused_seconds, 2),
+                "concurrency_limit": self.limit.current,
+                "concurrency_lowest": int(self.limit.lowest),
+                "concurrency_decreases": self.limit.decreases,
+            }
+
+    def print_summary(self):
+        stats = self.stats()
+        if not sum(stats["outcomes"].values()):
+            return
+        outcomes = ", ".join(f"{k}: {v}" for k, v in sorted(stats["outcomes"].items()))
+        print(
+            f"Page loads: {outcomes}; {stats['retries']} retries "
+            f"({stats['retry_after_honoured']} honoured Retry-After, "
+            f"{stats['backoff_seconds']:.0f}s backing off), "
+            f"{stats['breaker_trips']} circuit breaker trips "
+            f"({stats['paused_seconds']:.0f}s paused), concurrency limit "
+            f"{stats['concurrency_limit']} (lowest {stats['concurrency_lowest']})"
+        )
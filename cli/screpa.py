@@ -2,47 +2,156 @@
 """Screpa is a web scraping tool for Xing company search results"""
 
 import os
-import re
 import csv
 import time
 import sys
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
+from typing import List, Dict, Iterator, Optional, Set, Tuple
+from urllib.parse import quote, urlsplit, urlunsplit
+from browser_pool import BrowserPool
+from cache import ProfileCache
+from lead_store import LeadStore
+from metrics import Metrics, instrumented, peak_rss
+from recrawl import RecrawlScheduler
+from retry import OK, RetryPolicy, classify_status
+import parsers
+from checkpoint import Checkpoint, keyword_slug
+from session import SessionStore
+from resources import ResourceFilter
+from sinks import LEAD_FIELDS, CsvSink, JsonlSink, lead_key
+from spill import ResultSpill
+from selector_config import SELECTORS
+from waits import WaitStrategy, SEARCH_CARD_SELECTOR, PROFILE_READY_SELECTOR
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
 
 
 class Screpa:
     """Screpa class for Xing company search scraping"""
 
-    def __init__(self):
-        self.base_url = "https://www.xing.com"
+    def __init__(
+        self,
+        recycle_after: int = 50,
+        concurrency: int = 1,
+        rate_limit: float = 0.5,
+        cache_ttl: float = 7 * 24 * 3600,
+        cache_max_bytes: int = 500 * 1024 * 1024,
+        cache_compression: str = "gzip",
+        wait_ceiling: int = 15000,
+        incremental_pagination: bool = True,
+        parser_backend: str = "lxml",
+        results_dir: str = "results",
+        block_resources: bool = True,
+        headless: bool = False,
+        http_fetch: bool = False,
+        rich_summary: bool = False,
+        base_url: str = "https://www.xing.com",
+        login_url: str = "https://login.xing.com/?locale=en",
+        nav_timeout: int = 30000,
+        refresh_days: float = None,
+        bounded_memory: bool = False,
+        prune_every: int = 10,
+        recrawl: bool = False,
+        fetch_budget: int = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.login_url = login_url
         self.has_accepted_privacy = False
-        self.results_dir = Path("results")
-        self.results_dir.mkdir(exist_ok=True)
+        self.session_expired = False
+        self.results_dir = Path(results_dir)
         self.results_per_page = 10  # Standard number of results per page
-
+        self.recycle_after = recycle_after  # Navigations before a page is replaced
+        self.browser_pool = None
+        self.concurrency = concurrency  # Profiles fetched at once (async stage)
+        self.rate_limit = rate_limit  # Profile requests per second per host
+        # The cache and lead store are opened on first use, so extractor-only
+        # users (reextract, bench_parsers) never create or touch them
+        self._cache = None
+        self.cache_options = {
+            "ttl": cache_ttl,
+            "max_bytes": cache_max_bytes,
+            "compression": cache_compression,
+        }
+        # Stage timings and counters, written to a JSON report after each run
+        self.metrics = Metrics()
+        self.rich_summary = rich_summary
+        self.waits = WaitStrategy(ceiling=wait_ceiling, metrics=self.metrics)
+        self._lead_store = None
+        self.refresh_days = refresh_days  # Skip profiles enriched this recently
+        # Refetch only profiles whose revisit interval is up, at most
+        # `fetch_budget` per run
+        self.recrawl = (
+            RecrawlScheduler(self.results_dir / "recrawl.sqlite") if recrawl else None
+        )
+        self.fetch_budget = fetch_budget
+        # Profiles to load fresh even when the cache still holds them
+        self.refresh_urls: Set[str] = set()
+        # Status aware retries, circuit breaker and adaptive concurrency,
+        # shared by the sync and async page loads
+        self.retry_policy = RetryPolicy(timeout=nav_timeout, concurrency=concurrency)
+        # Logged in session reused across runs and browser contexts
+        self.session = SessionStore(
+            self.results_dir / "session.json", f"{self.base_url}/settings"
+        )
+        # Images, fonts, media and trackers are never read, don't load them
+        self.resource_filter = ResourceFilter() if block_resources else None
+        self.headless = headless
+        # Fetch profile pages over plain HTTP, using the browser as a fallback
+        self.http_fetch = http_fetch
+        self.http_fetcher = None
+        self.http_fallbacks: Set[str] = set()
+        # Spill results to disk, prune extracted cards from the live page and
+        # save the search HTML per range of `prune_every` pages
+        self.bounded_memory = bounded_memory
+        self.prune_every = max(1, prune_every)
+        # Only parse the cards appended by each "Show more" click
+        self.incremental_pagination = incremental_pagination or bounded_memory
+        self.parser_backend = parsers.check_backend(parser_backend)
+
+    @property
+    def cache(self) -> ProfileCache:
+        """Profile HTML cache, shared by the browser and HTTP paths"""
+        if self._cache is None:
+            self._cache = ProfileCache(self.results_dir / "cache", **self.cache_options)
+        return self._cache
+
+    @property
+    def lead_store(self) -> LeadStore:
+        """Every lead ever produced, upserted by profile URL"""
+        if self._lead_store is None:
+            self._lead_store = LeadStore(self.results_dir / "leads.sqlite")
+        return self._lead_store
+
+    @instrumented()
     def handle_privacy_consent(self, page, max_attempts=3):
         """Try to handle privacy consent dialog multiple times"""
+        consent_button = page.get_by_role("button", name="Accept all")
         for i in range(max_attempts):
             try:
-                consent_button = page.get_by_role("button", name="Accept all")
-                if consent_button.is_visible(timeout=2000):
-                    consent_button.click()
-                    print("Privacy consent accepted on attempt", i + 1)
-                    time.sleep(1)
-                    self.has_accepted_privacy = True
-                    return True
+                if not self.waits.for_locator(consent_button, "consent_visible", 2000):
+                    return False
+                consent_button.click()
+                print("Privacy consent accepted on attempt", i + 1)
+                self.waits.for_locator(
+                    consent_button, "consent_detached", state="detached"
+                )
+                self.has_accepted_privacy = True
+                return True
             except:  # noqa: E722
-                time.sleep(2)  # Wait before next attempt
+                continue
         return False
 
+    @instrumented()
     def login(self, page):
         """Handle Xing login with environment credentials"""
         try:
             page.goto(
-                "https://login.xing.com/?locale=en",
+                self.login_url,
                 timeout=120000,
             )
 
@@ -54,15 +163,22 @@ class Screpa:
             page.fill('input[name="password"]', os.getenv("XING_PASSWORD"))
             page.click('button:has-text("Log in")')
 
-            # Wait longer after login to ensure full page load
-            time.sleep(5)
+            # Wait until we are redirected away from the login page
+            login_page = urlunsplit(urlsplit(self.login_url)[:3] + ("", ""))
+            self.waits.for_url(
+                page,
+                lambda url: not url.startswith(login_page),
+                "login_redirect",
+                30000,
+            )
 
             # Check for privacy consent again after login
             if not self.has_accepted_privacy:
                 self.handle_privacy_consent(page)
 
-            # Wait for navigation to complete
-            page.wait_for_load_state("networkidle", timeout=30000)
+            # Wait for the landing page to finish loading
+            with self.waits.timed("login_load"):
+                page.wait_for_load_state("load", timeout=30000)
 
             # One final check for privacy consent
             if not self.has_accepted_privacy:
@@ -72,47 +188,109 @@ class Screpa:
             print(f"Login process error: {str(e)}")
             raise
 
-    def navigate_with_retry(self, page, url, max_retries=3):
-        """Navigate to URL with retry mechanism"""
+    @instrumented()
+    def ensure_login(self, context, page):
+        """Reuse the saved session if it is still valid, otherwise log in"""
+        if self.session.is_valid(context):
+            print("Reusing saved login session")
+            # The consent choice is stored with the session cookies
+            self.has_accepted_privacy = True
+            return
+
+        if self.session.exists():
+            print("Saved login session expired, logging in again")
+        self.login(page)
+        self.session.save(context)
+
+    def setup_context(self, context):
+        """Install request interception on a new browser context"""
+        if self.resource_filter is not None:
+            self.resource_filter.attach(context)
+
+    def profile_context_options(self) -> Dict:
+        """Browser context options for profile pages, with the saved session"""
+        return {
+            "viewport": {"width": 1920, "height": 1080},
+            **self.session.context_options(),
+        }
+
+    @instrumented()
+    def navigate_with_retry(
+        self, page, url, max_retries=None, wait_until="domcontentloaded"
+    ):
+        """Navigate to URL under the retry policy, returning the response"""
+        policy = self.retry_policy
+        max_retries = max_retries or policy.max_retries
         for attempt in range(max_retries):
+            policy.pause()
+            response = error = None
             try:
-                response = page.goto(
-                    url,
-                    timeout=120000,
-                    wait_until="networkidle",
-                )
-                if response and response.ok:
-                    return True
-
-                time.sleep(5 * (attempt + 1))  # Incremental backoff
-
+                with self.waits.timed("navigation"):
+                    response = page.goto(
+                        url,
+                        timeout=policy.timeout,
+                        wait_until=wait_until,
+                    )
             except Exception as e:
                 print(f"Navigation attempt {attempt + 1} failed: {str(e)}")
-                if attempt == max_retries - 1:
-                    raise
-                time.sleep(5 * (attempt + 1))
-        return False
-
+                error = e
+            outcome, delay = policy.decide(attempt, response, error, max_retries)
+            if outcome == OK:
+                return response
+            if response:
+                print(f"Navigation to {url} returned HTTP {response.status}")
+            if delay is None:
+                if error is not None:
+                    raise error
+                return None
+            self.backoff(delay)
+        return None
+
+    @instrumented("backoff_sleep")
+    def backoff(self, delay: float):
+        """Sleep before retrying a navigation"""
+        self.metrics.count("navigation_retries")
+        time.sleep(delay)
+
+    @instrumented()
+    def page_content(self, page) -> str:
+        return page.content()
+
+    @instrumented("parse_search")
     def extract_search_results(self, html: str) -> List[Dict]:
         """Extract basic company info from search results page"""
-        soup = BeautifulSoup(html, "html.parser")
-        results = []
+        if self.parser_backend == "selectolax":
+            return parsers.selectolax_search_results(html, self.base_url)
 
-        # Updated selector - looking for the search results list
-        results_section = soup.find(
-            "ol", {"class": "shared-styles__SearchList-sc-dfa70b15-3"}
+        soup = parsers.make_soup(
+            html, self.parser_backend, parsers.SEARCH_LIST_STRAINER
         )
+        results = []
+
+        results_section = SELECTORS.search_list.find(soup)
         if not results_section:
             print("No results section found")
             return results
 
-        # Updated selector for company cards
-        company_cards = results_section.find_all(
-            "li", {"class": "shared-styles__SearchListElement-sc-dfa70b15-4"}
-        )
+        company_cards = SELECTORS.search_card.find_all(results_section)
 
         print(f"Found {len(company_cards)} company cards")
 
+        return self.extract_cards(company_cards)
+
+    @instrumented("parse_search")
+    def extract_card_fragments(self, html: str) -> List[Dict]:
+        """Extract company info from the outer HTML of individual result cards"""
+        if self.parser_backend == "selectolax":
+            return parsers.selectolax_card_fragments(html, self.base_url)
+
+        soup = parsers.make_soup(html, self.parser_backend)
+        company_cards = SELECTORS.search_card.find_all(soup)
+        return self.extract_cards(company_cards)
+
+    def extract_cards(self, company_cards) -> List[Dict]:
+        """Extract basic company info from parsed result cards"""
+        results = []
         for card in company_cards:
             result_info = {
                 "company_name": "",
@@ -123,40 +301,16 @@ class Screpa:
             }
 
             try:
-                # Updated link selector
-                link = card.find(
-                    "a",
-                    {
-                        "class": "companies-search-results-styles__CompanyLinkWrapper-sc-5d3cf71d-1"
-                    },
-                )
+                link = SELECTORS.company_link.find(card)
                 if link:
                     result_info["profile_url"] = self.base_url + link.get("href")
 
-                # Updated company name selector
-                name_tag = card.find(
-                    "h2", {"class": "headline-styles__Headline-sc-339d833d-0"}
-                )
+                name_tag = SELECTORS.company_name.find(card)
                 if name_tag:
                     result_info["company_name"] = name_tag.text.strip()
 
-                # Updated company info selector - more specific class
-                info_paragraphs = card.find_all(
-                    "p", {"class": "body-copy-styles__BodyCopy-sc-b3916c1b-0"}
-                )
-
-                for p in info_paragraphs:
-                    text = p.text.strip()
-                    if "XING members:" in text:
-                        result_info["xing_members"] = text.split("XING members:")[
-                            1
-                        ].strip()
-                    elif "Employees:" in text:
-                        result_info["employee_count"] = text.split("Employees:")[
-                            1
-                        ].strip()
-                    elif text and ":" not in text:  # Location has no label
-                        result_info["location"] = text
+                for p in SELECTORS.company_info.find_all(card):
+                    parsers.apply_info_text(result_info, p.text.strip())
 
                 # Only add if we have at least a name
                 if result_info["company_name"]:
@@ -168,25 +322,54 @@ class Screpa:
 
         return results
 
+    @instrumented("parse_search")
+    def read_first_page(self, html: str) -> Tuple[List[Dict], int, List[str]]:
+        """Parse the first results page once for its results and selector check"""
+        backend = "html.parser" if self.parser_backend == "html.parser" else "lxml"
+        soup = parsers.make_soup(html, backend)
+        missing = self.validate_selectors(soup)
+        results_section = SELECTORS.search_list.find(soup)
+        if not results_section:
+            print("No results section found")
+            return [], 0, missing
+        company_cards = SELECTORS.search_card.find_all(results_section)
+        print(f"Found {len(company_cards)} company cards")
+        self.metrics.count("cards_extracted", len(company_cards))
+        return self.extract_cards(company_cards), len(company_cards), missing
+
+    def validate_selectors(self, soup) -> List[str]:
+        """Warn about search selectors that match nothing on a results page"""
+        missing = SELECTORS.validate_search_page(soup)
+        if missing == [SELECTORS.search_list.name]:
+            return missing
+        for name in missing:
+            print(f"Warning: selector '{name}' matched nothing on the first page")
+        self.metrics.count("selector_misses", len(missing))
+        return missing
+
     def clean_profile_url(self, url: str) -> str:
         """Clean up malformed profile URLs"""
         if url.startswith(self.base_url + self.base_url):
             return url[len(self.base_url) :]
         return url
 
+    @instrumented("parse_profile")
     def extract_company_contact(self, html: str) -> Dict[str, str]:
         """Extract contact info from company profile page HTML"""
+        if self.parser_backend == "selectolax":
+            return parsers.selectolax_company_contact(html)
+
         contact_info = {
             "website": "",
             "email": "",
         }
 
         try:
-            soup = BeautifulSoup(html, "html.parser")
+            soup = parsers.make_soup(html, self.parser_backend)
 
             # Find email and website combo
             # First look near mailto links as they're often paired
-            email_link = soup.find("a", href=lambda x: x and x.startswith("mailto:"))
+            email_link = soup.find("a", href=SELECTORS.email_href_re)
             if email_link:
                 email = email_link["href"].replace("mailto:", "").strip()
                 # Clean up any URL encoding or extra parameters
@@ -196,11 +379,7 @@ class Screpa:
 
                 # Look for website link near the email link
                 parent = email_link.parent
-                website_links = parent.find_all(
-                    "a",
-                    href=lambda x: x
-                    and re.match(r"https?://(?:www\.)?[^/]+\.[^/]+", str(x)),
-                )
+                website_links = parent.find_all("a", href=SELECTORS.website_re)
                 if website_links:
                     website = website_links[0]["href"].strip()
                     contact_info["website"] = website
@@ -208,10 +387,7 @@ class Screpa:
                     return contact_info
 
             # Fallback: Look for any website link with www
-            website_link = soup.find(
-                "a",
-                href=lambda x: x and re.match(r"https?://www\.[^/]+\.[^/]+", str(x)),
-            )
+            website_link = soup.find("a", href=SELECTORS.www_website_re)
             if website_link:
                 website = website_link["href"].strip()
                 contact_info["website"] = website
@@ -222,55 +398,202 @@ class Screpa:
 
         return contact_info
 
-    def scrape_company_profile(self, url: str) -> Dict[str, str]:
+    @instrumented("cache_read")
+    def load_cached_profile(self, clean_url: str, force_refresh: bool = False):
+        """Contact info from the cached profile page, or None on a miss"""
+        if force_refresh or clean_url in self.refresh_urls:
+            self.metrics.count("cache_bypassed")
+            return None
+        html = self.cache.get(clean_url)
+        if html is None:
+            self.metrics.count("cache_misses")
+            return None
+        self.metrics.count("cache_hits")
+
+        print(f"Using cached profile for {clean_url}")
+        return self.extract_company_contact(html)
+
+    @instrumented("cache_write")
+    def cache_profile(
+        self,
+        clean_url: str,
+        html: str,
+        status: int = None,
+        etag: str = None,
+        last_modified: str = None,
+    ):
+        """Store a fetched profile page in the cache"""
+        self.cache.put(clean_url, html, status, etag, last_modified)
+
+    def http_profile_fetcher(self):
+        """Shared HTTP client carrying the saved session's cookies"""
+        if self.http_fetcher is None or self.http_fetcher.closed:
+            from http_fetch import HttpProfileFetcher
+
+            if not self.session.exists():
+                print("No saved session, fetching profile pages without login")
+            fetcher = HttpProfileFetcher(
+                self.session.cookies(),
+                USER_AGENT,
+                max_connections=self.concurrency,
+                rate=self.rate_limit,
+                limit=self.retry_policy.limit,
+            )
+            if self.http_fetcher is not None:
+                # A new client picks up cookies from a fresh login, the
+                # counts still cover the whole run
+                fetcher.add_counts(self.http_fetcher)
+            self.http_fetcher = fetcher
+        return self.http_fetcher
+
+    @instrumented("http_fetch")
+    def fetch_over_http(self, clean_url: str, validators: Dict[str, str] = None):
+        """HTTP profile request under the retry policy, safe from worker threads"""
+        policy = self.retry_policy
+        fetcher = self.http_profile_fetcher()
+        response = None
+        for attempt in range(policy.max_retries):
+            policy.pause()
+            response = fetcher.fetch(clean_url, validators)
+            outcome, delay = policy.decide(attempt, response)
+            if delay is None:
+                break
+            if response is not None:
+                print(f"HTTP fetch of {clean_url} returned {response.status_code}")
+            self.backoff(delay)
+        return response
+
+    def contact_from_http_response(
+        self, clean_url: str, response
+    ) -> Optional[Dict[str, str]]:
+        """Contact info from an HTTP profile response, or None for the browser"""
+        from http_fetch import has_profile_markup
+
+        # Failed requests give {} like a failed browser load, retrying a
+        # throttled one in the browser only adds load
+        if response is None or classify_status(response.status_code) != OK:
+            if response is not None and response.status_code in (429, 503):
+                self.metrics.count("http_throttled")
+            self.metrics.count("http_failed")
+            return {}
+        if response.status_code == 304:
+            html = self.cache.refresh(clean_url)
+            if html is not None:
+                return self.extract_company_contact(html)
+        elif response.status_code == 200 and has_profile_markup(response.text):
+            self.cache_profile(
+                clean_url,
+                response.text,
+                response.status_code,
+                response.headers.get("etag"),
+                response.headers.get("last-modified"),
+            )
+            return self.extract_company_contact(response.text)
+
+        self.http_fetcher.record_fallback()
+        self.http_fallbacks.add(clean_url)
+        return None
+
+    @instrumented("profile")
+    def scrape_company_profile(
+        self, url: str, force_refresh: bool = False
+    ) -> Dict[str, str]:
         """Scrape an individual company profile page"""
         if not url:
             return {}
 
         clean_url = self.clean_profile_url(url)
-        url_hash = hash(clean_url)
-        cached_file = self.results_dir / f"company_{url_hash}.html"
-
-        if cached_file.exists():
-            print(f"Using cached profile from {cached_file}")
-            with open(cached_file, "r", encoding="utf-8") as f:
-                return self.extract_company_contact(f.read())
-
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=False)
-            context = browser.new_context(viewport={"width": 1920, "height": 1080})
-            page = context.new_page()
+        cached_contact = self.load_cached_profile(clean_url, force_refresh)
+        if cached_contact is not None:
+            return cached_contact
+
+        if self.http_fetch and clean_url not in self.http_fallbacks:
+            response = self.fetch_over_http(clean_url, self.cache.validators(clean_url))
+            contact = self.contact_from_http_response(clean_url, response)
+            if contact is not None:
+                return contact
+
+        if self.browser_pool is None:
+            # Standalone call, spin up a short-lived pool for this profile
+            with self.profile_pool():
+                return self.fetch_company_profile(clean_url)
+
+        return self.fetch_company_profile(clean_url)
+
+    @contextmanager
+    def profile_pool(self):
+        """Open a browser pool that profile fetches use until it is closed"""
+        with BrowserPool(
+            recycle_after=self.recycle_after,
+            headless=self.headless,
+            context_options=self.profile_context_options(),
+            setup_context=self.setup_context,
+        ) as pool:
+            self.browser_pool = pool
+            try:
+                yield pool
+            finally:
+                self.browser_pool = None
 
+    @instrumented("profile_browser")
+    def fetch_company_profile(self, clean_url: str) -> Dict[str, str]:
+        """Load a profile page from the browser pool and cache its HTML"""
+        with self.browser_pool.page() as page:
             try:
-                if not self.navigate_with_retry(page, clean_url):
+                response = self.navigate_with_retry(page, clean_url)
+                if not response:
                     return {}
 
-                time.sleep(5)  # Wait for dynamic content
-                html_content = page.content()
+                # Wait for the contact section to render
+                ready = self.waits.for_selector(
+                    page, PROFILE_READY_SELECTOR, "profile_contact", 10000
+                )
+                html_content = self.page_content(page)
+                if not self.is_profile_page(page.url, ready, html_content):
+                    return {}
 
                 # Cache the profile page
-                with open(cached_file, "w", encoding="utf-8") as f:
-                    f.write(html_content)
+                self.cache_profile(clean_url, html_content, response.status)
 
                 return self.extract_company_contact(html_content)
 
             except Exception as e:
                 print(f"Error scraping company profile {clean_url}: {str(e)}")
                 return {}
-            finally:
-                context.close()
+
+    def is_profile_page(self, url: str, ready: bool, html: str) -> bool:
+        """Check a loaded page is the profile and not a login or consent wall"""
+        on_login = urlsplit(url).netloc == urlsplit(self.login_url).netloc
+        if on_login or not (ready or SELECTORS.profile_markup_re.search(html)):
+            print(f"No profile page at {url}, the login session may have expired")
+            self.session_expired = True
+            self.metrics.count("profile_walls")
+            return False
+        return True
+
+    @instrumented()
+    def load_more_results(self, page) -> bool:
+        """Click 'Show more' and wait until new result cards are appended"""
+        # Look for the "Show more" button with exact text
+        show_more = page.get_by_role("button", name="Show more")
+        if not self.waits.for_locator(show_more, "show_more_visible", 5000):
+            return False
+
+        card_count = page.locator(SEARCH_CARD_SELECTOR).count()
+        show_more.click()
+        # Wait for new results to load
+        if not self.waits.for_count_above(
+            page, SEARCH_CARD_SELECTOR, card_count, "show_more_results"
+        ):
+            print("No new results appeared after clicking 'Show more'")
+        return True
 
     def click_show_more(self, page, clicks=2):
         """Click 'Show more' button multiple times to load more results"""
         for i in range(clicks):
             try:
-                # Look for the "Show more" button with exact text
-                show_more = page.get_by_role("button", name="Show more")
-                if show_more.is_visible(timeout=5000):
-                    show_more.click()
+                if self.load_more_results(page):
                     print(f"Clicked 'Show more' button ({i + 1}/{clicks})")
-                    # Wait for new results to load
-                    time.sleep(5)
                 else:
                     print("No more results to load")
                     break
@@ -278,110 +601,463 @@ class Screpa:
                 print(f"Error clicking 'Show more': {str(e)}")
                 break
 
+    def read_new_results(self, page, seen_cards: int) -> Tuple[List[Dict], int]:
+        """Extract results not yet seen on the live page, with the cards seen"""
+        if not self.incremental_pagination:
+            page_results = self.extract_search_results(self.page_content(page))
+            self.metrics.count("cards_extracted", len(page_results))
+            return page_results, len(page_results)
+
+        new_cards = page.eval_on_selector_all(
+            SEARCH_CARD_SELECTOR,
+            "(cards, start) => cards.slice(start).map(card => card.outerHTML)",
+            seen_cards,
+        )
+        print(f"Found {len(new_cards)} new company cards")
+        seen_cards += len(new_cards)
+        page_results = self.extract_card_fragments("".join(new_cards))
+        self.metrics.count("cards_extracted", len(page_results))
+        return page_results, seen_cards
+
+    def merge_new_results(
+        self, all_results: List[Dict], page_results: List[Dict], seen_keys: Set[str]
+    ) -> List[Dict]:
+        """Append results whose profile URL hasn't been seen, returning them"""
+        new_results = []
+        for result in page_results:
+            key = lead_key(result)
+            if key in seen_keys:
+                continue
+            seen_keys.add(key)
+            new_results.append(result)
+        all_results.extend(new_results)
+        return new_results
+
     def scrape_xing(self, keyword: str, pages: int = 2) -> List[Dict]:
+        """Search Xing and enrich every result, in search result order"""
+        results = self.search_xing(keyword, pages)
+        position = {lead_key(result): i for i, result in enumerate(results)}
+        leads = list(self.iter_enriched(results))
+        self.print_summaries()
+        return sorted(leads, key=lambda lead: position.get(lead_key(lead), len(leads)))
+
+    def iter_xing(
+        self, keyword: str, pages: int = 2, checkpoint: Checkpoint = None
+    ) -> Iterator[Dict]:
+        """Search Xing and yield each lead as soon as it is enriched"""
+        if checkpoint and checkpoint.has_search(pages):
+            print(
+                f"Resuming run {checkpoint.run_id}: search already done "
+                f"({len(checkpoint.results)} results)"
+            )
+            results = checkpoint.results
+        else:
+            results = self.search_xing(keyword, pages, checkpoint)
+
+        if checkpoint:
+            pending = checkpoint.pending(results)
+            print(
+                f"Resuming run {checkpoint.run_id}: "
+                f"{len(results) - len(pending)} of {len(results)} profiles "
+                "already enriched"
+            )
+            results = pending
+
+        for lead in self.iter_enriched(results):
+            if checkpoint:
+                checkpoint.record_enriched(lead)
+            yield lead
+        self.print_summaries()
+
+    def print_summaries(self):
+        """Print the summaries of a run and write its JSON run report"""
+        self.cache.print_stats()
+        self.waits.print_summary()
+        self.retry_policy.print_summary()
+        self.lead_store.print_stats()
+        if self.recrawl is not None:
+            self.recrawl.print_summary()
+        rss = peak_rss()
+        if rss:
+            print(
+                f"Peak RSS: {rss['self_mb']:.0f} MB scraper, "
+                f"{rss['children_mb']:.0f} MB largest child process"
+            )
+        if self.http_fetcher is not None:
+            self.http_fetcher.print_summary()
+        if self.resource_filter is not None:
+            self.resource_filter.print_summary()
+        self.write_run_report()
+        if self.rich_summary:
+            self.metrics.print_table()
+
+    def write_run_report(self) -> Path:
+        """Write stage timings, counters and subsystem stats to results/reports"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        extra = {
+            "cache": self.cache.stats(),
+            "waits": self.waits.summary(),
+            "retries": self.retry_policy.stats(),
+            "lead_store": {
+                "written": self.lead_store.written,
+                "inserted": self.lead_store.inserted,
+                "changed": self.lead_store.changed,
+            },
+        }
+        if self.recrawl is not None:
+            extra["recrawl"] = self.recrawl.stats()
+        if self.http_fetcher is not None:
+            extra["http"] = {
+                "fetched": self.http_fetcher.fetched,
+                "not_modified": self.http_fetcher.not_modified,
+                "fallbacks": self.http_fetcher.fallbacks,
+            }
+        if self.resource_filter is not None:
+            extra["blocked_requests"] = dict(self.resource_filter.blocked)
+        return self.metrics.write_report(
+            self.results_dir / "reports" / f"run_{timestamp}.json", **extra
+        )
+
+    def search_xing(
+        self, keyword: str, pages: int = 2, checkpoint: Checkpoint = None
+    ) -> List[Dict]:
         """Handle browser automation and HTML saving with pagination"""
-        all_results = []
-        total_possible_results = pages * self.results_per_page
+        try:
+            with self.search_session() as page:
+                return self.search_keyword(page, keyword, pages, checkpoint)
+        except Exception as e:
+            print(f"Scraping error: {str(e)}")
+            return list(checkpoint.results) if checkpoint else []
 
-        print(
-            f"\nSearching for '{keyword}' companies (up to {total_possible_results} results)..."
-        )
+    @contextmanager
+    def search_session(self):
+        """Launch the search browser, log in and yield the logged in page"""
+        from playwright.sync_api import sync_playwright
 
         with sync_playwright() as p:
             browser = p.chromium.launch(
-                headless=False,
+                headless=self.headless,
                 args=["--disable-features=site-per-process"],
             )
             context = browser.new_context(
-                user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+                user_agent=USER_AGENT,
                 viewport={"width": 1920, "height": 1080},
+                **self.session.context_options(),
             )
+            self.setup_context(context)
             page = context.new_page()
 
             try:
-                self.login(page)
-
-                search_url = f"https://www.xing.com/search/companies?keywords={keyword}"
-                if not self.navigate_with_retry(page, search_url):
-                    raise Exception("Failed to navigate to search results")
-
-                # Wait for initial results to load
-                time.sleep(5)
-
-                # Process first page results
-                html_content = page.content()
-                initial_results = self.extract_search_results(html_content)
-                all_results.extend(initial_results)
-                print(f"Page 1: Found {len(initial_results)} results")
-
-                # Click "Show more" button for remaining pages
-                for page_num in range(2, pages + 1):
-                    print(f"\nLoading page {page_num}...")
-                    try:
-                        show_more = page.get_by_role("button", name="Show more")
-                        if show_more.is_visible(timeout=5000):
-                            show_more.click()
-                            print(f"Clicked 'Show more' button for page {page_num}")
-                            time.sleep(5)
-
-                            html_content = page.content()
-                            page_results = self.extract_search_results(html_content)
-                            new_results = [
-                                r for r in page_results if r not in all_results
-                            ]
-                            all_results.extend(new_results)
-                            print(
-                                f"Page {page_num}: Found {len(new_results)} new results"
-                            )
-                            print(
-                                f"Total results so far: {len(all_results)} of {total_possible_results}"
+                self.ensure_login(context, page)
+                yield page
+            finally:
+                context.close()
+                browser.close()
+
+    @instrumented("search")
+    def search_keyword(
+        self, page, keyword: str, pages: int = 2, checkpoint: Checkpoint = None
+    ) -> List[Dict]:
+        """Run one keyword search on a logged in page with pagination"""
+        all_results = self.results_buffer(keyword, checkpoint)
+        snapshot_stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        range_start = 1
+        total_possible_results = pages * self.results_per_page
+
+        print(
+            f"\nSearching for '{keyword}' companies (up to {total_possible_results} results)..."
+        )
+
+        try:
+            search_url = f"{self.base_url}/search/companies?keywords={quote(keyword)}"
+            if not self.navigate_with_retry(page, search_url):
+                raise Exception("Failed to navigate to search results")
+
+            # A search without results renders no list, so only wait for
+            # cards once the list is there instead of sitting out the ceiling
+            self.waits.for_load_state(page, "networkidle", "search_settled")
+            if page.locator(SELECTORS.search_list.css).count():
+                self.waits.for_selector(page, SEARCH_CARD_SELECTOR, "search_results")
+
+            # Process first page results
+            page_results, seen_cards, missing = self.read_first_page(
+                self.page_content(page)
+            )
+            if SELECTORS.search_list.name in missing:
+                if checkpoint:
+                    checkpoint.finish_search(pages)
+                return all_results
+            if missing:
+                raise Exception(
+                    "Search result selectors matched nothing, update selectors.json"
+                )
+
+            if isinstance(all_results, ResultSpill):
+                seen_keys = all_results.keys()
+            else:
+                seen_keys = set(lead_key(r) for r in all_results)
+            initial_results = self.merge_new_results(
+                all_results, page_results, seen_keys
+            )
+            print(f"Page 1: Found {len(initial_results)} results")
+            if checkpoint:
+                checkpoint.record_page(all_results, initial_results)
+            last_page = 1
+
+            # Click "Show more" button for remaining pages
+            for page_num in range(2, pages + 1):
+                print(f"\nLoading page {page_num}...")
+                try:
+                    if self.load_more_results(page):
+                        print(f"Clicked 'Show more' button for page {page_num}")
+
+                        page_results, seen_cards = self.read_new_results(
+                            page, seen_cards
+                        )
+                        new_results = self.merge_new_results(
+                            all_results, page_results, seen_keys
+                        )
+                        print(f"Page {page_num}: Found {len(new_results)} new results")
+                        print(
+                            f"Total results so far: {len(all_results)} of {total_possible_results}"
+                        )
+                        if checkpoint:
+                            checkpoint.record_page(all_results, new_results)
+                        last_page = page_num
+                        if (
+                            self.bounded_memory
+                            and page_num - range_start + 1 >= self.prune_every
+                        ):
+                            self.save_snapshot(
+                                page, snapshot_stamp, range_start, page_num
                             )
-                        else:
-                            print("No more results available")
-                            break
-                    except Exception as e:
-                        print(f"Error loading page {page_num}: {str(e)}")
+                            seen_cards = self.prune_cards(page)
+                            range_start = page_num + 1
+                    else:
+                        print("No more results available")
                         break
+                except Exception as e:
+                    print(f"Error loading page {page_num}: {str(e)}")
+                    break
 
-                # Save the final HTML content
-                self.save_html_content(html_content)
+            # Save the final HTML content, or the last range of pages
+            if self.bounded_memory:
+                if last_page >= range_start:
+                    self.save_snapshot(page, snapshot_stamp, range_start, last_page)
+            else:
+                self.save_html_content(self.page_content(page))
+            if checkpoint:
+                checkpoint.finish_search(pages)
 
-            except Exception as e:
-                print(f"Scraping error: {str(e)}")
-                if "html_content" in locals():
-                    self.save_html_content(
-                        html_content, f"xing_error_{int(time.time())}.html"
-                    )
-            finally:
-                context.close()
+        except Exception as e:
+            print(f"Scraping error: {str(e)}")
+            try:
+                self.save_html_content(
+                    page.content(), f"xing_error_{int(time.time())}.html"
+                )
+            except Exception:
+                pass
+
+        return all_results
 
-        # Process contact info for all results with progress tracking
-        total_companies = len(all_results)
+    def results_buffer(self, keyword: str, checkpoint: Checkpoint = None):
+        """List or on-disk spill collecting a search, continuing the checkpoint"""
+        if checkpoint:
+            if self.bounded_memory:
+                return checkpoint.results
+            return [dict(result) for result in checkpoint.results]
+        if not self.bounded_memory:
+            return []
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return ResultSpill(
+            self.results_dir / "spill" / f"{keyword_slug(keyword)}-{timestamp}.jsonl"
+        )
+
+    def save_snapshot(self, page, stamp: str, first_page: int, last_page: int):
+        """Save the cards loaded for a range of pages to their own HTML file"""
+        self.save_html_content(
+            self.page_content(page),
+            f"xing_search_{stamp}_p{first_page}-{last_page}.html",
+        )
+
+    @instrumented()
+    def prune_cards(self, page) -> int:
+        """Remove extracted cards but the last from the page, return those left"""
+        remaining = page.eval_on_selector_all(
+            SEARCH_CARD_SELECTOR,
+            "cards => { cards.slice(0, -1).forEach(card => card.remove()); "
+            "return Math.min(cards.length, 1); }",
+        )
+        self.metrics.count("cards_pruned")
+        return remaining
+
+    def iter_enriched(self, results: List[Dict]) -> Iterator[Dict]:
+        """Enrich results with contact info, yielding each one when it is done"""
+        if self.recrawl is not None:
+            results, reused = self.recrawl.plan(results, self.fetch_budget)
+            due_urls = [
+                self.clean_profile_url(r["profile_url"])
+                for r in results
+                if r.get("profile_url")
+            ]
+            print(
+                f"Recrawl: fetching {len(due_urls)} due or new profiles, "
+                f"reusing {len(reused)}"
+            )
+            self.refresh_urls.update(due_urls)
+            for lead in reused:
+                self.lead_store.write(lead, enriched=False)
+                yield lead
+        elif self.refresh_days:
+            fresh, results = self.lead_store.split_fresh(results, self.refresh_days)
+            print(
+                f"Reusing {len(fresh)} profiles enriched within the last "
+                f"{self.refresh_days:g} days, {len(results)} left to fetch"
+            )
+            for lead in fresh:
+                self.lead_store.write(lead, enriched=False)
+                yield lead
+
+        for lead in self.iter_fetched(results):
+            if self.recrawl is not None:
+                self.recrawl.record(lead)
+            self.lead_store.write(lead)
+            yield lead
+        self.cache.flush()
+        if self.http_fetcher is not None:
+            self.http_fetcher.close()
+
+    def iter_fetched(self, results: List[Dict]) -> Iterator[Dict]:
+        """Fetch contact info for results, yielding each one when it is done"""
+        if self.http_fetch:
+            fallback = []
+            yield from self.iter_enriched_over_http(results, fallback)
+            results = fallback
+            if not results:
+                return
+
+        if self.concurrency > 1:
+            yield from self.iter_enriched_concurrently(results)
+            return
+
+        total_companies = len(results)
         print(f"\nProcessing contact info for {total_companies} companies...")
-        for idx, result in enumerate(all_results, 1):
-            if result.get("profile_url"):
-                print(
-                    f"\rFetching contact info for {result['company_name']} ({idx}/{total_companies})",
-                )
-                contact_info = self.scrape_company_profile(result["profile_url"])
-                result.update(contact_info)
+        # Reuse one browser for every profile instead of one per company
+        with self.profile_pool():
+            for idx, result in enumerate(results, 1):
+                if result.get("profile_url"):
+                    print(
+                        f"\rFetching contact info for {result['company_name']} ({idx}/{total_companies})",
+                    )
+                    contact_info = self.scrape_company_profile(result["profile_url"])
+                    result.update(contact_info)
+                yield result
         print("\nFinished fetching contact info")
 
-        return all_results
+    def iter_enriched_over_http(
+        self, results: List[Dict], fallback: List[Dict]
+    ) -> Iterator[Dict]:
+        """Enrich results over HTTP worker threads, yielding each when done"""
+        self.http_profile_fetcher()
+        jobs = []
+        for result in results:
+            if not result.get("profile_url"):
+                fallback.append(result)
+                continue
+            clean_url = self.clean_profile_url(result["profile_url"])
+            cached_contact = self.load_cached_profile(clean_url)
+            if cached_contact is not None:
+                result.update(cached_contact)
+                yield result
+                continue
+            jobs.append((result, clean_url, self.cache.validators(clean_url)))
+
+        print(f"\nFetching {len(jobs)} company profiles over HTTP...")
+        fetched = 0
+        browser_left = 0
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {
+                executor.submit(self.fetch_over_http, clean_url, validators): (
+                    result,
+                    clean_url,
+                )
+                for result, clean_url, validators in jobs
+            }
+            for future in as_completed(futures):
+                result, clean_url = futures[future]
+                contact = self.contact_from_http_response(clean_url, future.result())
+                if contact is None:
+                    fallback.append(result)
+                    browser_left += 1
+                    continue
+                result.update(contact)
+                fetched += 1 if contact else 0
+                yield result
+
+        elapsed = time.monotonic() - started
+        if jobs:
+            print(
+                f"Fetched {fetched} profiles over HTTP in {elapsed:.1f}s "
+                f"({len(jobs) / max(elapsed, 0.001) * 60:.1f} pages/min), "
+                f"{len(jobs) - fetched - browser_left} failed, "
+                f"{browser_left} left for the browser"
+            )
 
-    def save_to_csv(self, data: List[Dict]):
+    def iter_enriched_concurrently(self, results: List[Dict]) -> Iterator[Dict]:
+        """Yield results from the async enrichment stage as they complete"""
+        to_fetch = []
+        for result in results:
+            if not result.get("profile_url"):
+                yield result
+                continue
+            cached_contact = self.load_cached_profile(
+                self.clean_profile_url(result["profile_url"])
+            )
+            if cached_contact is not None:
+                result.update(cached_contact)
+                yield result
+            else:
+                to_fetch.append(result)
+        if not to_fetch:
+            return
+
+        enriched = queue.Queue()
+        errors = []
+
+        def run():
+            from enrich import ConcurrentEnricher
+
+            try:
+                ConcurrentEnricher(
+                    self, concurrency=self.concurrency, rate=self.rate_limit
+                ).run(to_fetch, on_result=lambda *item: enriched.put(item))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                enriched.put(None)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+
+        while True:
+            item = enriched.get()
+            if item is None:
+                break
+            result, fetched = item
+            if fetched is not None:
+                self.cache_profile(*fetched)
+            yield result
+
+        thread.join()
+        if errors:
+            raise errors[0]
+
+    def save_to_csv(self, data: List[Dict], filename: str = "screpa_leads.csv"):
         """Save results to CSV file"""
-        with open("screpa_leads.csv", "w", newline="", encoding="utf-8") as csvfile:
-            fieldnames = [
-                "company_name",
-                "xing_members",
-                "location",
-                "employee_count",
-                "profile_url",
-                "email",
-                "website",
-            ]
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        with open(filename, "w", newline="", encoding="utf-8") as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=LEAD_FIELDS)
             writer.writeheader()
             writer.writerows(data)
 
@@ -393,6 +1069,7 @@ class Screpa:
 
         filepath = self.results_dir / filename
         try:
+            filepath.parent.mkdir(parents=True, exist_ok=True)
             with open(filepath, "w", encoding="utf-8") as f:
                 f.write(html)
             print(f"Saved HTML content to {filepath}")
@@ -416,44 +1093,127 @@ class Screpa:
             return None, None
 
 
-if __name__ == "__main__":
+def run(
+    keyword: str,
+    pages: int = 2,
+    concurrency: int = 1,
+    resume: bool = False,
+    http_fetch: bool = False,
+    bounded_memory: bool = False,
+    rich_summary: bool = False,
+    refresh_days: float = None,
+    recrawl: bool = False,
+    fetch_budget: int = None,
+):
+    """Scrape one keyword into screpa_leads.csv and screpa_leads.jsonl"""
     required_envs = ["XING_EMAIL", "XING_PASSWORD"]
     if not all(os.getenv(e) for e in required_envs):
         print("Missing environment variables. Required:", required_envs)
         exit(1)
 
-    scraper = Screpa()
+    scraper = Screpa(
+        concurrency=concurrency,
+        http_fetch=http_fetch,
+        rich_summary=rich_summary,
+        refresh_days=refresh_days,
+        bounded_memory=bounded_memory,
+        recrawl=recrawl,
+        fetch_budget=fetch_budget,
+    )
+
+    checkpoint_dir = scraper.results_dir / "checkpoints"
+    checkpoint = Checkpoint.latest(checkpoint_dir, keyword) if resume else None
+    if resume and checkpoint is None:
+        print(f"No checkpoint found for '{keyword}', starting a new run")
+    if checkpoint is None:
+        checkpoint = Checkpoint(checkpoint_dir, keyword)
+
+    print("Configuration:")
+    print(f"- Search keyword: {keyword}")
+    print(f"- Number of pages to scrape: {pages}")
+    print(f"- Maximum possible results: {pages * scraper.results_per_page}")
+    print(f"- Concurrent profile fetches: {concurrency}")
+    print(
+        f"- Profile fetching: {'HTTP with browser fallback' if http_fetch else 'browser'}"
+    )
+    print(f"- Run: {checkpoint.run_id}{' (resumed)' if resume else ''}")
+
+    try:
+        # Leads are written as soon as they are enriched, so a crash keeps
+        # everything produced so far
+        sample_lead = None
+        with CsvSink("screpa_leads.csv", append=resume) as csv_sink, JsonlSink(
+            "screpa_leads.jsonl", append=resume
+        ) as jsonl_sink:
+            for lead in scraper.iter_xing(keyword, pages, checkpoint):
+                csv_sink.write(lead)
+                jsonl_sink.write(lead)
+                sample_lead = sample_lead or lead
+        print(f"\nCompleted! Saved {csv_sink.written} leads to CSV and JSONL")
+        # Only an interrupted run is worth resuming
+        if checkpoint.search_complete:
+            removed = checkpoint.remove()
+            print(f"Removed {removed} checkpoint files of finished runs")
+        if sample_lead:
+            print("\nSample lead:", sample_lead)
+    except Exception as e:
+        print(f"Error: {str(e)}")
+
+
+if __name__ == "__main__":
     print("Screpa Lead Generator v1.0.0")
 
     # Handle command line arguments
     keyword = "real estate"
     pages = 2
-
-    if len(sys.argv) > 1:
+    concurrency = 1
+    resume = "--resume" in sys.argv
+    http_fetch = "--http" in sys.argv
+    bounded_memory = "--bounded" in sys.argv
+    rich_summary = "--rich" in sys.argv
+    recrawl = "--recrawl" in sys.argv
+    refresh_days = None
+    fetch_budget = None
+    for arg in sys.argv[1:]:
+        if arg.startswith("--refresh-days="):
+            refresh_days = float(arg.split("=", 1)[1])
+        elif arg.startswith("--budget="):
+            fetch_budget = int(arg.split("=", 1)[1])
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+
+    if len(args) > 0:
         # Get keyword (use empty input to keep default)
-        input_keyword = sys.argv[1].strip()
+        input_keyword = args[0].strip()
         if input_keyword:
             keyword = input_keyword
 
-    if len(sys.argv) > 2:
+    if len(args) > 1:
         # Get number of pages (use empty input to keep default)
         try:
-            input_pages = int(sys.argv[2])
+            input_pages = int(args[1])
             if input_pages > 0:
                 pages = input_pages
         except ValueError:
             print(f"Invalid page number, using default: {pages}")
 
-    print("Configuration:")
-    print(f"- Search keyword: {keyword}")
-    print(f"- Number of pages to scrape: {pages}")
-    print(f"- Maximum possible results: {pages * scraper.results_per_page}")
-
-    try:
-        results = scraper.scrape_xing(keyword, pages)
-        scraper.save_to_csv(results)
-        print(f"\nCompleted! Saved {len(results)} leads to CSV")
-        if results:
-            print("\nSample lead:", results[0])
-    except Exception as e:
-        print(f"Error: {str(e)}")
+    if len(args) > 2:
+        # Get number of profiles to fetch concurrently
+        try:
+            input_concurrency = int(args[2])
+            if input_concurrency > 0:
+                concurrency = input_concurrency
+        except ValueError:
+            print(f"Invalid concurrency, using default: {concurrency}")
+
+    run(
+        keyword,
+        pages,
+        concurrency,
+        resume=resume,
+        http_fetch=http_fetch,
+        bounded_memory=bounded_memory,
+        rich_summary=rich_summary,
+        refresh_days=refresh_days,
+        recrawl=recrawl,
+        fetch_budget=fetch_budget,
+    )
@@ -0,0 +1,100 @@
+"""Versioned, data-driven selectors for the extractors
+
+Xing's class names are hashed styled-components names
+(`shared-styles__SearchListElement-sc-dfa70b15-4`) whose hash suffix
+rotates with their deploys. selectors.json lists each element by tag and
+class prefix instead, and is compiled once at import into the matchers
+every backend needs: a class regex for BeautifulSoup (and its strainer)
+and CSS for selectolax and Playwright.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, List
+
+SELECTORS_PATH = Path(__file__).with_name("selectors.json")
+SUPPORTED_VERSION = 1
+
+
+class Selector:
+    """One element matched by tag and class name prefix"""
+
+    def __init__(self, name: str, tag: str, class_prefix: str):
+        self.name = name
+        self.tag = tag
+        self.class_prefix = class_prefix
+        # Matches a single class value and a raw class attribute string
+        self.class_re = re.compile(rf"(?:^|\s){re.escape(class_prefix)}")
+        self.css = f'{tag}[class^="{class_prefix}"], {tag}[class*=" {class_prefix}"]'
+
+    def find(self, node):
+        """First matching BeautifulSoup element under `node`, or None"""
+        return node.find(self.tag, {"class": self.class_re})
+
+    def find_all(self, node):
+        return node.find_all(self.tag, {"class": self.class_re})
+
+    def within(self, parent: "Selector") -> str:
+        """CSS for this element inside `parent`"""
+        return ", ".join(
+            f"{outer} {inner}"
+            for outer in parent.css.split(", ")
+            for inner in self.css.split(", ")
+        )
+
+
+class SelectorConfig:
+    """Compiled selectors and patterns from a selectors.json file"""
+
+    def __init__(self, config: Dict):
+        version = config.get("version")
+        if version != SUPPORTED_VERSION:
+            raise ValueError(
+                f"Unsupported selector config version {version}, "
+                f"expected {SUPPORTED_VERSION}"
+            )
+        self.version = version
+        search = config["search"]
+        self.search_list = Selector("search_list", **search["search_list"])
+        self.search_card = Selector("search_card", **search["search_card"])
+        self.company_link = Selector("company_link", **search["company_link"])
+        self.company_name = Selector("company_name", **search["company_name"])
+        self.company_info = Selector("company_info", **search["company_info"])
+        self.card_fields = (self.company_link, self.company_name, self.company_info)
+        # Rendered result cards, for Playwright waits and DOM queries
+        self.search_card_css = self.search_card.within(self.search_list)
+
+        profile = config["profile"]
+        self.profile_ready_css = profile["ready"]
+        self.profile_markup_re = re.compile(profile["markup_pattern"], re.IGNORECASE)
+        self.email_href_re = re.compile(profile["email_href_pattern"])
+        self.website_re = re.compile(profile["website_pattern"])
+        self.www_website_re = re.compile(profile["www_website_pattern"])
+
+    @classmethod
+    def load(cls, path: Path = SELECTORS_PATH) -> "SelectorConfig":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def validate_search_page(self, soup) -> List[str]:
+        """Names of search selectors that match nothing on a parsed page
+
+        Card fields are checked within the matched cards, so a rotated
+        class name shows up after the first page instead of as a run of
+        empty leads.
+        """
+        results_section = self.search_list.find(soup)
+        if results_section is None:
+            return [self.search_list.name]
+        cards = self.search_card.find_all(results_section)
+        if not cards:
+            return [self.search_card.name]
+        return [
+            selector.name
+            for selector in self.card_fields
+            if not any(selector.find(card) for card in cards)
+        ]
+
+
+SELECTORS = SelectorConfig.load()
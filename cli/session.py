@@ -0,0 +1,60 @@
+"""Persisted authenticated browser session so runs can skip the login flow"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List
+
+
+class SessionStore:
+    """Playwright storage state (cookies + localStorage) saved after login
+
+    The saved state is loaded into every browser context. Before trusting
+    it, `is_valid` sends one request to an authenticated page through the
+    context's request API (no page render) and checks that it isn't
+    redirected to the login page.
+    """
+
+    def __init__(self, path: Path, probe_url: str):
+        self.path = Path(path)
+        self.probe_url = probe_url
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def context_options(self) -> Dict:
+        """Extra new_context() options that load the saved session"""
+        if not self.exists():
+            return {}
+        return {"storage_state": str(self.path)}
+
+    def cookies(self) -> List[Dict]:
+        """Cookies of the saved session, for clients other than the browser"""
+        if not self.exists():
+            return []
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f).get("cookies", [])
+
+    def is_valid(self, context) -> bool:
+        """Cheaply check that the session loaded into `context` is logged in"""
+        if not self.exists():
+            return False
+        try:
+            response = context.request.get(
+                self.probe_url, max_redirects=0, timeout=15000
+            )
+        except Exception as e:
+            print(f"Session probe failed: {str(e)}")
+            return False
+
+        location = response.headers.get("location", "")
+        if 300 <= response.status < 400:
+            return "login" not in location
+        return response.ok
+
+    def save(self, context):
+        """Save the context's session, readable only by the current user"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        context.storage_state(path=str(self.path))
+        os.chmod(self.path, 0o600)
+        print(f"Saved login session to {self.path}")
@@ -0,0 +1,154 @@
+"""Streaming lead sinks that persist leads as soon as they are produced"""
+
+import csv
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict
+
+LEAD_FIELDS = [
+    "company_name",
+    "xing_members",
+    "location",
+    "employee_count",
+    "profile_url",
+    "email",
+    "website",
+]
+
+
+class Lead:
+    """Compact lead record with dict-style access, one slot per lead field
+
+    A field that was never set reads as missing, so `"email" in lead` still
+    tells whether the profile was enriched, as with dicts.
+    """
+
+    __slots__ = tuple(LEAD_FIELDS)
+
+    def __init__(self, fields: Dict = None, **kwargs):
+        self.update(fields or {}, **kwargs)
+
+    def __getitem__(self, field: str):
+        try:
+            return getattr(self, field)
+        except AttributeError:
+            raise KeyError(field) from None
+
+    def __setitem__(self, field: str, value):
+        if field not in self.__slots__:
+            raise KeyError(field)
+        setattr(self, field, value)
+
+    def __contains__(self, field) -> bool:
+        return field in self.__slots__ and hasattr(self, field)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __repr__(self) -> str:
+        return f"Lead({dict(self)!r})"
+
+    def get(self, field: str, default=None):
+        return getattr(self, field, default) if field in self.__slots__ else default
+
+    def keys(self):
+        return [field for field in self.__slots__ if hasattr(self, field)]
+
+    def items(self):
+        return [(field, getattr(self, field)) for field in self.keys()]
+
+    def update(self, fields: Dict = (), **kwargs):
+        for field, value in dict(fields, **kwargs).items():
+            self[field] = value
+
+
+def lead_key(lead: Dict) -> str:
+    """Identity of a lead, its profile URL or the company name without one"""
+    return lead.get("profile_url") or lead.get("company_name", "")
+
+
+class LeadSink:
+    """Append-only lead writer with bounded buffering and periodic fsync
+
+    Leads are handed to the OS after every `flush_every` writes (1 means
+    each lead is visible to other readers immediately) and forced to disk
+    at most every `fsync_interval` seconds, so a crash loses at most that
+    window. With `append=False` the file is truncated when opened.
+    """
+
+    def __init__(
+        self,
+        path,
+        append: bool = False,
+        flush_every: int = 1,
+        fsync_interval: float = 5.0,
+    ):
+        self.path = Path(path)
+        self.flush_every = max(1, flush_every)
+        self.fsync_interval = fsync_interval
+        self.written = 0
+        self._pending = 0
+        self._last_fsync = time.monotonic()
+        self._is_new = (
+            not append or not self.path.exists() or not self.path.stat().st_size
+        )
+        self.file = open(
+            self.path, "a" if append else "w", newline="", encoding="utf-8"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _write(self, lead: Dict):
+        raise NotImplementedError
+
+    def write(self, lead: Dict):
+        """Write one lead, flushing and fsyncing on schedule"""
+        self._write(lead)
+        self.written += 1
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self, fsync: bool = False):
+        self.file.flush()
+        self._pending = 0
+        now = time.monotonic()
+        if fsync or now - self._last_fsync >= self.fsync_interval:
+            os.fsync(self.file.fileno())
+            self._last_fsync = now
+
+    def close(self):
+        if not self.file.closed:
+            self.flush(fsync=True)
+            self.file.close()
+
+
+class CsvSink(LeadSink):
+    """Append leads to a CSV file, writing the header only once"""
+
+    def __init__(self, path, fieldnames=LEAD_FIELDS, **kwargs):
+        super().__init__(path, **kwargs)
+        self.writer = csv.DictWriter(
+            self.file, fieldnames=fieldnames, extrasaction="ignore"
+        )
+        if self._is_new:
+            self.writer.writeheader()
+
+    def _write(self, lead: Dict):
+        self.writer.writerow(lead)
+
+
+class JsonlSink(LeadSink):
+    """Append leads to a JSON Lines file, one object per line"""
+
+    def _write(self, lead: Dict):
+        self.file.write(json.dumps(dict(lead), ensure_ascii=False) + "\n")
@@ -0,0 +1,50 @@
+"""Search results spilled to disk so deep searches run in bounded memory"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Set
+
+from sinks import Lead, lead_key
+
+
+class ResultSpill:
+    """Append-only JSON Lines list of search results
+
+    Stands in for the `all_results` list in bounded memory mode: results
+    are written out as they are found and read back as compact `Lead`
+    records, so only their count stays in memory. Without `resume` the
+    file is truncated.
+    """
+
+    def __init__(self, path: Path, resume: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not resume or not self.path.exists():
+            self.path.write_text("", encoding="utf-8")
+        self.count = sum(1 for _ in self._lines())
+
+    def _lines(self) -> Iterator[str]:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield line
+
+    def extend(self, results: Iterable[Dict]):
+        with open(self.path, "a", encoding="utf-8") as f:
+            for result in results:
+                f.write(json.dumps(dict(result), ensure_ascii=False) + "\n")
+                self.count += 1
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Lead]:
+        for line in self._lines():
+            try:
+                yield Lead(json.loads(line))
+            except ValueError:
+                continue  # Torn last line from a crash
+
+    def keys(self) -> Set[str]:
+        """Identity of every spilled result"""
+        return {lead_key(result) for result in self}
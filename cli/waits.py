@@ -0,0 +1,115 @@
+"""Event-driven page waits with hard ceilings and timing records"""
+
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from selector_config import SELECTORS
+
+# Elements that mark a rendered search result card and profile contact section
+SEARCH_CARD_SELECTOR = SELECTORS.search_card_css
+PROFILE_READY_SELECTOR = SELECTORS.profile_ready_css
+
+
+class WaitStrategy:
+    """Wait on concrete DOM conditions instead of fixed sleeps
+
+    Every wait is capped by a ceiling (in milliseconds) and returns False
+    instead of raising when the ceiling is hit, so callers can carry on with
+    whatever has rendered. How long each wait actually took is recorded per
+    wait name.
+    """
+
+    def __init__(self, ceiling: int = 15000, metrics=None):
+        self.ceiling = ceiling
+        self.metrics = metrics  # Also fed to the run's Metrics as "wait.<name>"
+        self.timings = defaultdict(list)
+        self.timeouts = defaultdict(int)
+
+    @contextmanager
+    def timed(self, name: str):
+        """Record the duration of the wrapped block under `name`"""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            self.timings[name].append(elapsed)
+            if self.metrics is not None:
+                self.metrics.observe(f"wait.{name}", elapsed)
+
+    def _run(self, name: str, wait, timeout: Optional[int]) -> bool:
+        with self.timed(name):
+            try:
+                wait(timeout or self.ceiling)
+                return True
+            except Exception:
+                self.timeouts[name] += 1
+                return False
+
+    def for_selector(
+        self, page, selector: str, name: str, timeout: int = None, state="visible"
+    ) -> bool:
+        """Wait until an element matching `selector` reaches `state`"""
+        return self._run(
+            name,
+            lambda ms: page.wait_for_selector(selector, state=state, timeout=ms),
+            timeout,
+        )
+
+    def for_locator(
+        self, locator, name: str, timeout: int = None, state="visible"
+    ) -> bool:
+        """Wait until a locator reaches `state` (e.g. "detached" for dialogs)"""
+        return self._run(
+            name, lambda ms: locator.wait_for(state=state, timeout=ms), timeout
+        )
+
+    def for_count_above(
+        self, page, selector: str, count: int, name: str, timeout: int = None
+    ) -> bool:
+        """Wait until more than `count` elements match `selector`"""
+        return self._run(
+            name,
+            lambda ms: page.wait_for_function(
+                "([selector, count]) => "
+                "document.querySelectorAll(selector).length > count",
+                arg=[selector, count],
+                timeout=ms,
+            ),
+            timeout,
+        )
+
+    def for_load_state(self, page, state: str, name: str, timeout: int = None) -> bool:
+        """Wait until the page reaches a load state (e.g. "networkidle")"""
+        return self._run(
+            name, lambda ms: page.wait_for_load_state(state, timeout=ms), timeout
+        )
+
+    def for_url(self, page, predicate, name: str, timeout: int = None) -> bool:
+        """Wait until the page URL satisfies `predicate`"""
+        return self._run(
+            name, lambda ms: page.wait_for_url(predicate, timeout=ms), timeout
+        )
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Count, total, mean and max seconds spent per wait name"""
+        return {
+            name: {
+                "count": len(durations),
+                "total": sum(durations),
+                "mean": sum(durations) / len(durations),
+                "max": max(durations),
+                "timeouts": self.timeouts[name],
+            }
+            for name, durations in self.timings.items()
+            if durations
+        }
+
+    def print_summary(self):
+        for name, stats in self.summary().items():
+            print(
+                f"Wait {name}: {stats['count']}x, mean {stats['mean']:.2f}s, "
+                f"max {stats['max']:.2f}s, {stats['timeouts']} hit the ceiling"
+            )